@@ -22,6 +22,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed parser when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Config names: only letters, numbers, underscores, and hyphens
+_CONFIG_NAME_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
+# Windows reserved device names (compared lowercase)
+_RESERVED_CONFIG_NAMES = frozenset({"con", "prn", "aux", "nul"})
+
 
 class DeckyCLI:
     """Main CLI handler for Decky commands."""
@@ -57,7 +66,7 @@ class DeckyCLI:
             raise ValueError("Config name cannot be empty")
 
         # Only allow alphanumeric characters, underscores, and hyphens
-        if not re.match(r"^[a-zA-Z0-9_-]+$", config_name):
+        if not _CONFIG_NAME_RE.match(config_name):
             raise ValueError(
                 f"Invalid config name: '{config_name}'. "
                 f"Use only letters, numbers, underscores, and hyphens."
@@ -71,7 +80,7 @@ class DeckyCLI:
             )
 
         # Prevent names that might be confusing or dangerous
-        if config_name.lower() in ["con", "prn", "aux", "nul"]:  # Windows reserved
+        if config_name.lower() in _RESERVED_CONFIG_NAMES:
             raise ValueError(f"Invalid config name: '{config_name}' is a reserved name.")
 
         logger.debug(f"Config name validated: {config_name}")
@@ -337,7 +346,7 @@ class DeckyCLI:
 
         try:
             with open(config_file, "r") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_SafeLoader)  # nosec B506
 
             # Basic validation checks
             errors = []
@@ -362,6 +371,9 @@ class DeckyCLI:
 
             # Validate page structure
             if "pages" in config:
+                # Collect every page name up front so forward references resolve
+                page_names = frozenset(config["pages"])
+
                 for page_name, page_config in config["pages"].items():
                     if "buttons" not in page_config:
                         warnings.append(f"Page '{page_name}' has no buttons defined")
@@ -381,6 +393,17 @@ class DeckyCLI:
                                 action = button_config["action"]
                                 if "type" not in action:
                                     warnings.append(f"Button {button_num} has action without type")
+                                elif action["type"] == "page":
+                                    if "page" not in action:
+                                        warnings.append(
+                                            f"Button {button_num} on page '{page_name}' "
+                                            "has page action without 'page' target"
+                                        )
+                                    elif action["page"] not in page_names:
+                                        warnings.append(
+                                            f"Button {button_num} on page '{page_name}' "
+                                            f"switches to unknown page '{action['page']}'"
+                                        )
 
             # Print results
             if errors:
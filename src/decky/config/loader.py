@@ -2,9 +2,11 @@
 Configuration loader for Decky
 """
 
+import copy
+import hashlib
 import logging
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import yaml
 
@@ -13,6 +15,23 @@ logger = logging.getLogger(__name__)
 # Maximum config file size (1MB should be plenty for YAML configs)
 MAX_CONFIG_SIZE = 1024 * 1024
 
+# Style applied when a config does not define a "default" style
+DEFAULT_STYLE: Dict[str, Any] = {
+    "font": "DejaVu Sans",
+    "font_size": 14,
+    "text_color": "#FFFFFF",
+    "background_color": "#000000",
+    "text_align": "bottom",
+    "text_offset": 0,
+}
+
+# Prefer the libyaml-backed parser when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Content digest and parsed config of each loaded file, shared by every
+# loader so unchanged files are not parsed again
+_PARSED_CONFIGS: Dict[Path, Tuple[bytes, Dict[str, Any]]] = {}
+
 
 class ConfigLoader:
     """Loads and validates YAML configuration files"""
@@ -50,8 +69,16 @@ class ConfigLoader:
             )
 
         try:
-            with open(resolved_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            data = resolved_path.read_bytes()
+
+            # Skip parsing when the content matches the last parse of this file
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            cached = _PARSED_CONFIGS.get(resolved_path)
+            if cached and cached[0] == digest:
+                logger.debug(f"Configuration content unchanged, reusing {resolved_path}")
+                return copy.deepcopy(cached[1])
+
+            config = yaml.load(data, Loader=_SafeLoader)  # nosec B506
 
             # Validate basic structure
             self._validate(config)
@@ -59,6 +86,10 @@ class ConfigLoader:
             # Apply defaults
             config = self._apply_defaults(config)
 
+            # Callers get their own copy so changes never reach the shared entry
+            _PARSED_CONFIGS[resolved_path] = (digest, config)
+            config = copy.deepcopy(config)
+
             logger.info(f"Loaded configuration from {resolved_path}")
             return config
 
@@ -142,14 +173,7 @@ class ConfigLoader:
         if "styles" not in config:
             config["styles"] = {}
         if "default" not in config["styles"]:
-            config["styles"]["default"] = {
-                "font": "DejaVu Sans",
-                "font_size": 14,
-                "text_color": "#FFFFFF",
-                "background_color": "#000000",
-                "text_align": "bottom",
-                "text_offset": 0,
-            }
+            config["styles"]["default"] = dict(DEFAULT_STYLE)
 
         # Feedback defaults
         if "feedback" not in config:
@@ -28,6 +28,9 @@ class DeckyController:
     - PageManager: Handles page rendering and button updates
     """
 
+    # Timing constants
+    TICK_INTERVAL = 0.01  # Seconds between main loop iterations
+
     def __init__(self, config_path: str) -> None:
         """
         Initialize the Decky controller.
@@ -191,6 +194,12 @@ class DeckyController:
         else:
             logger.error(f"Unknown action type: {action_type}")
 
+    def _run_once(self) -> None:
+        """Run a single main loop iteration."""
+        # Update animations if we have a deck
+        if self.deck:
+            self.page_manager.update_animated_buttons(self.deck, self.config)
+
     def run(self) -> None:
         """
         Main application run loop.
@@ -218,12 +227,10 @@ class DeckyController:
 
         try:
             while self.running:
-                # Update animations if we have a deck
-                if self.deck:
-                    self.page_manager.update_animated_buttons(self.deck, self.config)
+                self._run_once()
 
                 # Short sleep to prevent CPU spinning
-                time.sleep(0.01)
+                time.sleep(self.TICK_INTERVAL)
 
         except KeyboardInterrupt:
             logger.info("Received shutdown signal")
@@ -0,0 +1,112 @@
+"""
+USB hot-plug notifications for Stream Deck devices.
+
+Uses udev (via the optional ``pyudev`` package) to report Stream Deck
+add/remove events as they happen, so reconnection does not have to wait
+for the next polling interval. When pyudev or udev is unavailable the
+monitor simply does not start and polling remains the only mechanism.
+"""
+
+import logging
+from typing import Any, Callable, Optional
+
+try:
+    import pyudev
+except ImportError:  # pragma: no cover - depends on optional extra
+    pyudev = None
+
+logger = logging.getLogger(__name__)
+
+# Elgato's USB vendor ID, shared by every Stream Deck model
+ELGATO_VENDOR_ID = 0x0FD9
+
+
+class HotplugMonitor:
+    """
+    Watch udev for Stream Deck USB add/remove events.
+
+    The callback runs on the observer thread and receives the udev action
+    (``"add"`` or ``"remove"``), so it should only signal other threads.
+    """
+
+    def __init__(self, on_event: Callable[[str], None]):
+        """
+        Initialize the hot-plug monitor.
+
+        Args:
+            on_event: Callback invoked with the udev action for each Stream Deck event
+        """
+        self.on_event = on_event
+        self._observer: Optional[Any] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether udev events are currently being delivered."""
+        return self._observer is not None
+
+    def start(self) -> bool:
+        """
+        Start listening for udev events.
+
+        Returns:
+            True if the monitor started, False if hot-plug events are unavailable.
+        """
+        if self._observer is not None:
+            return True
+
+        if pyudev is None:
+            logger.debug("pyudev not installed - relying on polling for USB hot-plug")
+            return False
+
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            # The USB device is announced before its HID interface is bound, so
+            # adds are taken from the hidraw node and removes from the USB device
+            monitor.filter_by(subsystem="hidraw")
+            monitor.filter_by(subsystem="usb", device_type="usb_device")
+            observer = pyudev.MonitorObserver(
+                monitor, callback=self._handle_device, name="HotplugMonitor"
+            )
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            logger.warning(f"USB hot-plug events unavailable, relying on polling: {e}")
+            return False
+
+        self._observer = observer
+        logger.debug("USB hot-plug monitoring started")
+        return True
+
+    def stop(self) -> None:
+        """Stop listening for udev events."""
+        if self._observer is None:
+            return
+
+        self._observer.send_stop()
+        self._observer = None
+        logger.debug("USB hot-plug monitoring stopped")
+
+    def _handle_device(self, device: Any) -> None:
+        """Forward hidraw adds and USB removes for Elgato devices to the callback."""
+        if device.action == "add" and device.subsystem == "hidraw":
+            # HID_ID is "bus:vendor:product" in hex on the parent HID device
+            hid = device.find_parent("hid")
+            fields = hid.get("HID_ID", "").split(":") if hid is not None else []
+            vendor = fields[1] if len(fields) > 1 else ""
+        elif device.action == "remove" and device.subsystem == "usb":
+            # PRODUCT is "vendor/product/bcd" in hex and is present on remove events,
+            # unlike sysfs attributes which are gone by then
+            vendor = device.get("PRODUCT", "").split("/")[0]
+        else:
+            return
+
+        try:
+            if int(vendor, 16) != ELGATO_VENDOR_ID:
+                return
+        except ValueError:
+            return
+
+        try:
+            self.on_event(device.action)
+        except Exception as e:
+            logger.error(f"Error handling USB hot-plug event: {e}")
@@ -6,9 +6,11 @@ including enumeration, connection, disconnection, and connection monitoring.
 """
 
 import logging
+import time
 from typing import Any, Optional
 
 from StreamDeck.DeviceManager import DeviceManager as StreamDeckManager
+from StreamDeck.Transport.Transport import TransportError
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,9 @@ class DeviceManager:
     robust connection state detection.
     """
 
+    # Seconds to wait before each re-attempt when open() hits a transient USB error
+    OPEN_RETRY_DELAYS = (0.05, 0.1, 0.2)
+
     def __init__(self):
         """Initialize the device manager."""
         self._stream_deck_manager = StreamDeckManager()
@@ -48,10 +53,18 @@ class DeviceManager:
 
             # Connect to the first available device
             deck = available_decks[0]
-            deck.open()
-
-            # Reset device to clear any previous state
-            deck.reset()
+            try:
+                self._open(deck)
+
+                # Reset device to clear any previous state
+                deck.reset()
+            except Exception:
+                # Release a partially opened handle so failed attempts don't leak it
+                try:
+                    deck.close()
+                except Exception as close_error:
+                    logger.debug(f"Could not close Stream Deck after failed open: {close_error}")
+                raise
 
             # Log device information for debugging
             device_info = f"{deck.deck_type()} ({deck.key_count()} keys)"
@@ -59,7 +72,7 @@ class DeviceManager:
 
             return deck
 
-        except OSError as e:
+        except (OSError, TransportError) as e:
             # USB/HID communication errors
             logger.error(f"USB communication error during Stream Deck connection: {e}")
             return None
@@ -68,6 +81,27 @@ class DeviceManager:
             logger.error(f"Unexpected error connecting to Stream Deck: {e}")
             return None
 
+    def _open(self, deck) -> None:
+        """
+        Open a device, retrying briefly on USB/HID errors.
+
+        The HID handle can be reported missing for a moment after a previous
+        session closed it, so a failed open is retried with backoff before
+        the error is allowed to propagate.
+
+        Args:
+            deck: The Stream Deck device to open.
+        """
+        for delay in self.OPEN_RETRY_DELAYS:
+            try:
+                deck.open()
+                return
+            except (OSError, TransportError) as e:
+                logger.debug(f"Stream Deck open failed, retrying in {delay}s: {e}")
+                time.sleep(delay)
+
+        deck.open()
+
     def disconnect(self, deck) -> bool:
         """
         Disconnect from a Stream Deck device.
@@ -117,9 +151,9 @@ class DeviceManager:
         """
         Check if a Stream Deck device is still connected and responsive.
 
-        This method attempts to communicate with the device to verify
-        it's still connected. This is used for detecting USB disconnection
-        events (device unplugged).
+        This method asks the HID transport whether the device is still
+        attached to the host, treating any error as a lost connection. This
+        is used for detecting USB disconnection events (device unplugged).
 
         Args:
             deck: The Stream Deck device to check.
@@ -131,10 +165,13 @@ class DeviceManager:
             return False
 
         try:
-            # Attempt to query device state to verify connection
-            # The is_visual() method is lightweight and reliable for this purpose
-            _ = deck.is_visual()
-            return True
+            # connected() re-enumerates HID devices, so it notices an unplug
+            # even before any write to the deck fails
+            if deck.connected():
+                return True
+
+            logger.debug("Stream Deck connection lost (USB disconnected)")
+            return False
 
         except OSError as e:
             # USB device has been disconnected
@@ -4,15 +4,57 @@ Animation management for Stream Deck buttons.
 Handles GIF animations including frame loading, timing, and rendering.
 """
 
+import array
+import functools
+import heapq
 import logging
+import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from PIL import Image
+from PIL import Image, ImageOps, ImageSequence
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _decode_gif(
+    path: str, mtime_ns: int, image_size: Optional[Tuple[int, int]] = None
+) -> Optional[Tuple[Tuple[Any, ...], Tuple[int, ...]]]:
+    """
+    Decode every frame of an animated GIF.
+
+    Cached per (path, mtime, size) so a GIF shown on several keys or pages is
+    only decoded once, and re-decoded when the file changes. Frames are shared
+    between buttons; the renderer copies them before drawing.
+
+    Args:
+        path: Path to GIF file
+        mtime_ns: File modification time, part of the cache key
+        image_size: Key image size to pre-fit frames to, or None for full size
+
+    Returns:
+        Tuple of (frames, durations in ns), or None if the GIF is not animated
+    """
+    gif = Image.open(path)
+    if not (hasattr(gif, "is_animated") and gif.is_animated):
+        return None
+
+    frames = []
+    durations = []
+    for frame in ImageSequence.Iterator(gif):
+        durations.append(frame.info.get("duration", 100) * 1_000_000)
+        if image_size:
+            # Same scale-to-fill and centre crop the renderer applies, done once;
+            # convert() already yields a new image, so no copy is needed
+            frames.append(ImageOps.fit(frame.convert("RGBA"), image_size, Image.Resampling.LANCZOS))
+        else:
+            # The iterator re-seeks one image in place, so snapshot each frame
+            frames.append(frame.copy())
+
+    return tuple(frames), tuple(durations)
+
+
 class AnimationManager:
     """
     Manages animated GIF buttons.
@@ -23,8 +65,8 @@ class AnimationManager:
     - Synchronized animation updates
     """
 
-    # Animation update interval for smooth playback
-    UPDATE_INTERVAL = 0.05  # 50ms = 20 FPS
+    # Animation update interval for smooth playback (monotonic nanoseconds)
+    UPDATE_INTERVAL_NS = 50_000_000  # 50ms = 20 FPS
 
     def __init__(self, button_renderer):
         """
@@ -35,10 +77,17 @@ class AnimationManager:
         """
         self.button_renderer = button_renderer
         self.animated_buttons: Dict[int, Dict[str, Any]] = {}
-        self._last_update = 0.0
+        self._last_update_ns = 0
+
+        # Min-heap of (next frame deadline in ns, key index), one entry per button
+        self._deadlines: List[Tuple[int, int]] = []
 
     def setup_animated_button(
-        self, key_index: int, button_config: Dict[str, Any], icon_file: str
+        self,
+        key_index: int,
+        button_config: Dict[str, Any],
+        icon_file: str,
+        image_size: Optional[Tuple[int, int]] = None,
     ) -> bool:
         """
         Set up animated GIF frames for a button.
@@ -47,33 +96,34 @@ class AnimationManager:
             key_index: Zero-based key index
             button_config: Button configuration from YAML
             icon_file: Path to GIF file
+            image_size: Deck key image size; frames are pre-fitted to it when given
 
         Returns:
             True if animation was set up successfully, False otherwise
         """
         try:
-            gif = Image.open(icon_file)
-            if not (hasattr(gif, "is_animated") and gif.is_animated):
+            decoded = _decode_gif(icon_file, os.stat(icon_file).st_mtime_ns, image_size)
+            if decoded is None:
                 logger.debug(f"File {icon_file} is not an animated GIF")
                 return False
 
-            frames = []
-            durations = []
-
-            for frame_num in range(gif.n_frames):
-                gif.seek(frame_num)
-                frame = gif.copy()
-                frames.append(frame)
-                durations.append(gif.info.get("duration", 100))
+            frames, durations = decoded
 
             if frames:
                 self.animated_buttons[key_index] = {
-                    "frames": frames,
-                    "durations": durations,
+                    "frames": list(frames),
+                    # Nanosecond values exceed 32 bits, so a signed 64-bit array
+                    "durations_ns": array.array("q", durations),
                     "current_frame": 0,
-                    "last_update": time.time(),
+                    "last_update_ns": time.monotonic_ns(),
                     "config": button_config,
+                    # Key images rendered on first display of each frame
+                    "rendered": [None] * len(frames),
                 }
+                anim_data = self.animated_buttons[key_index]
+                heapq.heappush(
+                    self._deadlines, (anim_data["last_update_ns"] + durations[0], key_index)
+                )
                 logger.debug(f"Loaded {len(frames)} frames for animated button {key_index+1}")
                 return True
 
@@ -95,6 +145,9 @@ class AnimationManager:
         """
         Render the current frame for an animated button.
 
+        Each frame is rendered once and reused on later loops; the cache is
+        dropped with the animation when the page or config changes.
+
         Args:
             key_index: Zero-based key index
             styles: Style configuration dictionary
@@ -107,10 +160,17 @@ class AnimationManager:
             return None
 
         anim_data = self.animated_buttons[key_index]
-        frame = anim_data["frames"][anim_data["current_frame"]]
-        button_config = anim_data["config"]
-
-        return self.button_renderer.render_button_with_icon(button_config, styles, deck, frame)
+        frame_index = anim_data["current_frame"]
+        rendered = anim_data.setdefault("rendered", [None] * len(anim_data["frames"]))
+
+        image = rendered[frame_index]
+        if image is None:
+            frame = anim_data["frames"][frame_index]
+            image = self.button_renderer.render_button_with_icon(
+                anim_data["config"], styles, deck, frame
+            )
+            rendered[frame_index] = image
+        return image
 
     def update_animations(self, deck: Any) -> None:
         """
@@ -124,28 +184,31 @@ class AnimationManager:
         if not deck or not self.animated_buttons:
             return
 
-        current_time = time.time()
+        current_time = time.monotonic_ns()
 
         # Throttle updates to target frame rate
-        if current_time - self._last_update < self.UPDATE_INTERVAL:
+        if current_time - self._last_update_ns < self.UPDATE_INTERVAL_NS:
             return
 
-        # Update each animated button
-        for _key_index, anim_data in list(self.animated_buttons.items()):
-            # Check if it's time to advance to next frame
-            frame_duration = anim_data["durations"][anim_data["current_frame"]] / 1000.0
-            if current_time - anim_data["last_update"] >= frame_duration:
-                # Advance to next frame
-                anim_data["current_frame"] = (anim_data["current_frame"] + 1) % len(
-                    anim_data["frames"]
-                )
-                anim_data["last_update"] = current_time
+        # Entries added or removed without setup/clear leave the heap out of step
+        if len(self._deadlines) != len(self.animated_buttons):
+            self._reschedule()
 
-                # Update button image with new frame
-                # Note: We can't render here without access to styles/config
-                # This will be handled by the controller calling render_current_frame
+        # Advance only the buttons whose next frame is due
+        while self._deadlines and self._deadlines[0][0] <= current_time:
+            _deadline, key_index = heapq.heappop(self._deadlines)
+            anim_data = self.animated_buttons.get(key_index)
+            if anim_data is None:
+                continue
+            anim_data["current_frame"] = (anim_data["current_frame"] + 1) % len(anim_data["frames"])
+            anim_data["last_update_ns"] = current_time
+            # Zero-length frames still wait for the next tick rather than spinning here
+            next_duration = max(anim_data["durations_ns"][anim_data["current_frame"]], 1)
+            heapq.heappush(self._deadlines, (current_time + next_duration, key_index))
 
-        self._last_update = current_time
+            # Button images are pushed by the page manager via render_current_frame
+
+        self._last_update_ns = current_time
 
     def synchronize_animations(self) -> None:
         """
@@ -156,18 +219,31 @@ class AnimationManager:
         if not self.animated_buttons:
             return
 
-        current_time = time.time()
+        current_time = time.monotonic_ns()
         for anim_data in self.animated_buttons.values():
-            anim_data["last_update"] = current_time
+            anim_data["last_update_ns"] = current_time
             anim_data["current_frame"] = 0
+        self._reschedule()
 
         logger.debug(f"Synchronized {len(self.animated_buttons)} animated buttons")
 
     def clear_animations(self) -> None:
         """Clear all animated button data (called when switching pages)."""
         self.animated_buttons.clear()
+        self._deadlines.clear()
         logger.debug("Cleared all animated buttons")
 
+    def _reschedule(self) -> None:
+        """Rebuild the deadline heap from every animated button's current frame."""
+        self._deadlines = [
+            (
+                anim_data["last_update_ns"] + anim_data["durations_ns"][anim_data["current_frame"]],
+                key,
+            )
+            for key, anim_data in self.animated_buttons.items()
+        ]
+        heapq.heapify(self._deadlines)
+
     def has_animations(self) -> bool:
         """Check if there are any active animations."""
         return len(self.animated_buttons) > 0
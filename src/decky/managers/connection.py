@@ -9,6 +9,7 @@ import threading
 import time
 from typing import Any, Callable, Optional
 
+from ..device.hotplug import HotplugMonitor
 from ..device.manager import DeviceManager
 from ..platforms.base import Platform
 
@@ -29,6 +30,8 @@ class ConnectionManager:
     # Timing constants
     RECONNECT_INTERVAL = 2.0  # Seconds between reconnection attempts
     CONNECTION_CHECK_INTERVAL = 0.5  # How often to check connection status
+    MONITOR_TICK = 0.01  # Seconds the monitor idles between ticks
+    MONITOR_ERROR_BACKOFF = 1.0  # Seconds the monitor idles after an error
 
     def __init__(
         self,
@@ -57,9 +60,17 @@ class ConnectionManager:
         self.is_locked = False
 
         self._monitor_thread: Optional[threading.Thread] = None
+        self._wake_event = threading.Event()
         self._last_reconnect_attempt = 0.0
         self._last_connection_check = 0.0
 
+        # Notified after every deck or screen lock transition so callers can
+        # wait_for() a state instead of polling it
+        self._state_cv = threading.Condition()
+
+        # udev add/remove events skip the polling throttles when available
+        self.hotplug_monitor = HotplugMonitor(on_event=self._on_hotplug)
+
     def connect(self) -> bool:
         """
         Establish connection to a Stream Deck device.
@@ -81,6 +92,7 @@ class ConnectionManager:
             if self.on_connected:
                 self.on_connected(self.deck)
 
+            self._notify_state_change()
             return True
 
         except Exception as e:
@@ -110,6 +122,8 @@ class ConnectionManager:
         if self.on_disconnected:
             self.on_disconnected()
 
+        self._notify_state_change()
+
         if clean_disconnect:
             logger.info("Stream Deck disconnected")
         else:
@@ -141,16 +155,22 @@ class ConnectionManager:
             return
 
         self.running = True
+        self._wake_event.clear()
         self._monitor_thread = threading.Thread(
             target=self._monitor_loop, daemon=True, name="ConnectionMonitor"
         )
         self._monitor_thread.start()
+        self.hotplug_monitor.start()
         logger.debug("Connection monitoring started")
 
     def stop_monitoring(self) -> None:
         """Stop the connection monitoring thread."""
         self.running = False
         self.shutting_down = True
+        self.hotplug_monitor.stop()
+
+        # Interrupt any idle wait so the thread exits promptly
+        self.wake()
 
         if self._monitor_thread:
             self._monitor_thread.join(timeout=3)
@@ -158,26 +178,64 @@ class ConnectionManager:
 
         logger.debug("Connection monitoring stopped")
 
+    def _notify_state_change(self) -> None:
+        """Wake any threads waiting on a deck or lock state change."""
+        with self._state_cv:
+            self._state_cv.notify_all()
+
+    def _on_hotplug(self, action: str) -> None:
+        """
+        Respond to a Stream Deck USB event without waiting for the next interval.
+
+        Args:
+            action: udev action, "add" or "remove"
+        """
+        logger.debug(f"Stream Deck USB {action} event")
+        # Reconnects run inside the health check, so both actions need it due now
+        self._last_connection_check = 0
+        if action == "add":
+            self._last_reconnect_attempt = 0
+        self.wake()
+
+    def wake(self) -> None:
+        """Wake the monitoring thread so it re-checks state immediately."""
+        self._wake_event.set()
+
+    def _idle(self, timeout: float) -> None:
+        """Wait between monitor ticks, returning early if woken."""
+        self._wake_event.wait(timeout)
+        self._wake_event.clear()
+
     def _monitor_loop(self) -> None:
         """Main monitoring loop (runs in background thread)."""
         while self.running:
             try:
-                current_time = time.time()
+                self._monitor_once()
 
-                # Check connection health periodically
-                if current_time - self._last_connection_check >= self.CONNECTION_CHECK_INTERVAL:
-                    self._check_connection_health(current_time)
-                    self._last_connection_check = current_time
-
-                # Monitor screen lock status
-                self._check_screen_lock()
-
-                # Short sleep to prevent CPU spinning
-                time.sleep(0.01)
+                # Short idle to prevent CPU spinning
+                self._idle(self.MONITOR_TICK)
 
             except Exception as e:
                 logger.error(f"Error in connection monitor: {e}", exc_info=True)
-                time.sleep(1)
+                self._idle(self.MONITOR_ERROR_BACKOFF)
+
+    def _monitor_once(self, current_time: Optional[float] = None) -> None:
+        """
+        Run a single monitoring tick.
+
+        Args:
+            current_time: Timestamp to evaluate intervals against (defaults to now)
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        # Check connection health periodically
+        if current_time - self._last_connection_check >= self.CONNECTION_CHECK_INTERVAL:
+            self._check_connection_health(current_time)
+            self._last_connection_check = current_time
+
+        # Monitor screen lock status
+        self._check_screen_lock()
 
     def _check_connection_health(self, current_time: float) -> None:
         """
@@ -222,5 +280,7 @@ class ConnectionManager:
                     if self.connect():
                         logger.info("Stream Deck reconnected after unlock")
 
+                self._notify_state_change()
+
         except Exception as e:
             logger.error(f"Error checking screen lock: {e}")
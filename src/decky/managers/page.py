@@ -39,6 +39,9 @@ class PageManager:
         self.current_page = "main"
         self._page_lock = threading.Lock()  # Prevent concurrent page/animation updates
 
+        # Image last sent to each animated key, to skip rewriting unchanged frames
+        self._last_sent: Dict[int, bytes] = {}
+
     def switch_page(self, page_name: str, deck: Any, config: Dict[str, Any]) -> bool:
         """
         Switch to a different page.
@@ -80,6 +83,7 @@ class PageManager:
 
             # Clear animated buttons from previous page
             self.animation_manager.clear_animations()
+            self._last_sent.clear()
 
             # Clear all buttons to black first (prevents retention issues)
             blank_image = self.button_renderer.render_blank(deck)
@@ -121,11 +125,15 @@ class PageManager:
             icon_file = self._find_icon(icon_path)
             if icon_file:
                 # Try to set up animation
-                if self.animation_manager.setup_animated_button(key, button_config, icon_file):
+                image_size = deck.key_image_format()["size"]
+                if self.animation_manager.setup_animated_button(
+                    key, button_config, icon_file, image_size
+                ):
                     # Render initial frame
                     frame_image = self.animation_manager.render_current_frame(key, styles, deck)
                     if frame_image:
                         deck.set_key_image(key, frame_image)
+                        self._last_sent[key] = frame_image
                     return  # Animation set up successfully
 
         # Render static button
@@ -156,12 +164,24 @@ class PageManager:
 
             # Render updated frames
             styles = config.get("styles", {})
+            pending = []
             for key_index in list(self.animation_manager.animated_buttons.keys()):
                 frame_image = self.animation_manager.render_current_frame(
                     key_index, styles, deck
                 )
-                if frame_image:
+                # Skip the USB write when the key already shows this image; cached
+                # frames usually match by identity, which bytes equality checks first
+                if frame_image and frame_image != self._last_sent.get(key_index):
+                    pending.append((key_index, frame_image))
+
+            if not pending:
+                return
+
+            # Hold the deck lock once for the whole tick rather than per key
+            with deck:
+                for key_index, frame_image in pending:
                     deck.set_key_image(key_index, frame_image)
+                    self._last_sent[key_index] = frame_image
         finally:
             self._page_lock.release()
 
@@ -2,53 +2,64 @@
 Pytest configuration and fixtures
 """
 
-import tempfile
-from pathlib import Path
+import copy
 from unittest.mock import MagicMock, Mock
 
 import pytest
 import yaml
 
+# Prefer the libyaml-backed emitter when available
+_Dumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+SAMPLE_CONFIG = {
+    "device": {"brightness": 75},
+    "styles": {
+        "default": {
+            "font": "DejaVu Sans",
+            "font_size": 14,
+            "text_color": "#FFFFFF",
+            "background_color": "#000000",
+            "text_align": "bottom",
+            "text_offset": 0,
+        }
+    },
+    "pages": {
+        "main": {
+            "name": "Main",
+            "buttons": {
+                1: {
+                    "text": "Test",
+                    "style": "default",
+                    "action": {"type": "command", "command": "echo test"},
+                },
+                2: {"icon": "test.png", "action": {"type": "application", "app": "test-app"}},
+                3: {"text": "Page 2", "action": {"type": "page", "page": "secondary"}},
+            },
+        },
+        "secondary": {"name": "Secondary", "buttons": {}},
+    },
+}
+
+# SAMPLE_CONFIG is constant, so serialize it once per session
+_SERIALIZED_SAMPLE = yaml.dump(SAMPLE_CONFIG, Dumper=_Dumper).encode("utf-8")
+
+# Stand-ins for subprocess.Popen/run and their result, built once and shared by every test
+_SUB_SENTINEL = Mock(returncode=0)
+_POPEN_MOCK = Mock(return_value=_SUB_SENTINEL)
+_RUN_MOCK = Mock(return_value=_SUB_SENTINEL)
+
 
 @pytest.fixture
 def sample_config():
     """Sample configuration for testing"""
-    return {
-        "device": {"brightness": 75},
-        "styles": {
-            "default": {
-                "font": "DejaVu Sans",
-                "font_size": 14,
-                "text_color": "#FFFFFF",
-                "background_color": "#000000",
-                "text_align": "bottom",
-                "text_offset": 0,
-            }
-        },
-        "pages": {
-            "main": {
-                "name": "Main",
-                "buttons": {
-                    1: {
-                        "text": "Test",
-                        "style": "default",
-                        "action": {"type": "command", "command": "echo test"},
-                    },
-                    2: {"icon": "test.png", "action": {"type": "application", "app": "test-app"}},
-                    3: {"text": "Page 2", "action": {"type": "page", "page": "secondary"}},
-                },
-            },
-            "secondary": {"name": "Secondary", "buttons": {}},
-        },
-    }
+    return copy.deepcopy(SAMPLE_CONFIG)
 
 
 @pytest.fixture
-def config_file(tmp_path, sample_config):
+def config_file(tmp_path):
     """Create a temporary config file"""
     config_path = tmp_path / "test_config.yaml"
-    with open(config_path, "w") as f:
-        yaml.dump(sample_config, f)
+    config_path.write_bytes(_SERIALIZED_SAMPLE)
     return config_path
 
 
@@ -56,7 +67,7 @@ def config_file(tmp_path, sample_config):
 def mock_deck():
     """Mock Stream Deck device"""
     deck = MagicMock()
-    deck.is_visual.return_value = True
+    deck.connected.return_value = True
     deck.is_open.return_value = True
     deck.key_count.return_value = 15
     deck.get_serial_number.return_value = "TEST123"
@@ -96,10 +107,15 @@ def action_context(mock_deck, mock_platform):
 @pytest.fixture(autouse=True)
 def no_subprocess_calls(monkeypatch):
     """Prevent actual subprocess calls during testing"""
-    mock_popen = Mock()
-    mock_popen.returncode = 0
-    monkeypatch.setattr("subprocess.Popen", Mock(return_value=mock_popen))
-    monkeypatch.setattr("subprocess.run", Mock(return_value=Mock(returncode=0)))
+    # Reuse the module-level mocks, dropping anything a previous test configured
+    # (reset_mock keeps return values and plain attributes unless told otherwise)
+    _SUB_SENTINEL.reset_mock(return_value=True, side_effect=True)
+    _SUB_SENTINEL.returncode = 0
+    for subprocess_mock in (_POPEN_MOCK, _RUN_MOCK):
+        subprocess_mock.reset_mock(return_value=True, side_effect=True)
+        subprocess_mock.return_value = _SUB_SENTINEL
+    monkeypatch.setattr("subprocess.Popen", _POPEN_MOCK)
+    monkeypatch.setattr("subprocess.run", _RUN_MOCK)
 
 
 @pytest.fixture
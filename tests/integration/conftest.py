@@ -0,0 +1,211 @@
+"""
+Shared fixtures for integration tests
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+from decky.device.renderer import ButtonRenderer
+from decky.managers import ConnectionManager
+
+# Minimal configuration shared by the main loop and reconnection tests
+MOCK_CONFIG_STR = """
+device:
+  brightness: 75
+
+styles:
+  default:
+    font: DejaVu Sans
+    font_size: 14
+    text_color: '#FFFFFF'
+    background_color: '#000000'
+
+pages:
+  main:
+    name: Main
+    buttons:
+      1:
+        text: Test
+        action:
+          type: command
+          command: echo test
+"""
+
+
+@pytest.fixture(scope="session")
+def mock_config(tmp_path_factory):
+    """Write the minimal test configuration once and return its path"""
+    config_file = tmp_path_factory.mktemp("cfg") / "test_config.yaml"
+    config_file.write_text(MOCK_CONFIG_STR)
+    return str(config_file)
+
+
+@pytest.fixture(scope="session")
+def parsed_mock_config():
+    """Parsed form of the minimal test configuration (treat as read-only)"""
+    return yaml.load(MOCK_CONFIG_STR, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+# Key image format reported by the mocked Stream Deck (treat as read-only)
+DECK_IMAGE_FORMAT = {
+    "size": (72, 72),
+    "format": "JPEG",
+    "rotation": 0,
+    "mirror": (False, False),
+    "flip": (False, False),
+}
+
+
+# StreamDeck methods the controller uses, plus the context manager that holds
+# the device lock around batched writes; anything else is a test error
+DECK_METHODS = (
+    "__enter__",
+    "__exit__",
+    "deck_type",
+    "key_count",
+    "key_image_format",
+    "connected",
+    "set_brightness",
+    "set_key_callback",
+    "set_key_image",
+    "reset",
+    "close",
+    "open",
+)
+
+# Return values configured on every mock deck in one configure_mock call
+_DECK_RETURN_VALUES = {
+    "deck_type.return_value": "Stream Deck",
+    "key_count.return_value": 15,
+    "key_image_format.return_value": DECK_IMAGE_FORMAT,
+    "connected.return_value": True,
+}
+
+
+def make_mock_deck():
+    """Build a mock Stream Deck limited to the methods the controller uses"""
+    deck = MagicMock(spec_set=DECK_METHODS)
+    deck.configure_mock(**_DECK_RETURN_VALUES)
+    return deck
+
+
+# Built once; tests share it and the fixture restores its configuration
+_DECK_PROTOTYPE = make_mock_deck()
+
+
+@pytest.fixture
+def mock_deck():
+    """Shared mock Stream Deck device, reset to its default configuration"""
+    _DECK_PROTOTYPE.reset_mock(return_value=True, side_effect=True)
+    _DECK_PROTOTYPE.configure_mock(**_DECK_RETURN_VALUES)
+    return _DECK_PROTOTYPE
+
+
+# Compressed monitor cadence so reconnect/lock paths run in milliseconds
+FAST_INTERVAL = 0.02
+
+# Simulated seconds between steps, well past every monitor interval
+STEP_SECONDS = 10.0
+
+
+@pytest.fixture
+def fast_intervals(monkeypatch):
+    """Shrink reconnect and connection-check intervals"""
+    monkeypatch.setattr(ConnectionManager, "RECONNECT_INTERVAL", FAST_INTERVAL)
+    monkeypatch.setattr(ConnectionManager, "CONNECTION_CHECK_INTERVAL", FAST_INTERVAL)
+
+
+@pytest.fixture
+def step():
+    """Return a helper that runs one monitor tick and one main loop tick at step ``n``"""
+
+    def run(controller, n):
+        controller.connection_manager._monitor_once(current_time=n * STEP_SECONDS)
+        controller._run_once()
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def mock_manager(monkeypatch):
+    """Replace the StreamDeck library manager for every integration test"""
+    manager = MagicMock()
+    monkeypatch.setattr("decky.device.manager.StreamDeckManager", manager)
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def fast_render(monkeypatch):
+    """Skip PIL rendering; the mock deck discards key images and no test inspects them"""
+    monkeypatch.setattr(ButtonRenderer, "render_button", lambda self, *args, **kwargs: b"")
+    monkeypatch.setattr(ButtonRenderer, "render_blank", lambda self, *args, **kwargs: b"")
+
+
+@pytest.fixture
+def lockable_platform(monkeypatch):
+    """
+    Patch platform detection with a plain test platform.
+
+    The monitor polls is_screen_locked on every tick, so this is a bare
+    callable reading ``locked`` rather than a call-recording mock.
+    """
+    platform = SimpleNamespace(name="test", locked=False)
+    platform.is_screen_locked = lambda: platform.locked
+    monkeypatch.setattr("decky.controller.detect_platform", lambda: platform)
+    return platform
+
+
+@pytest.fixture(scope="module")
+def run_executor():
+    """Single worker thread reused for every controller run loop in a module"""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DeckyRun")
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def run_controller(run_executor):
+    """Start a controller's run loop on the shared worker; always stopped on teardown"""
+    started = []
+
+    def start(controller):
+        started.append(controller)
+        return run_executor.submit(controller.run)
+
+    yield start
+
+    for controller in started:
+        controller.running = False
+        controller.shutting_down = True
+
+
+@pytest.fixture
+def stop_controller():
+    """Return a helper that stops a run loop and fails if it does not exit promptly"""
+
+    def stop(controller, run_future, timeout=0.5):
+        controller.running = False
+        controller.shutting_down = True
+        try:
+            run_future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            pytest.fail("run() did not exit")
+
+    return stop
+
+
+@pytest.fixture
+def wait_for_state():
+    """Return a helper that blocks until a controller state predicate holds"""
+
+    def wait(controller, predicate, timeout=3.0):
+        state_cv = controller.connection_manager._state_cv
+        with state_cv:
+            return state_cv.wait_for(predicate, timeout=timeout)
+
+    return wait
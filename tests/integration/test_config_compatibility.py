@@ -2,20 +2,24 @@
 Integration tests for configuration compatibility - preventing breaking changes
 """
 
-import tempfile
-from pathlib import Path
-
 import pytest
 import yaml
 
+from decky.actions.registry import ActionRegistry
 
-class TestConfigurationCompatibility:
-    """Test that configuration format remains backward compatible"""
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-    def test_legacy_config_format(self, tmp_path):
-        """Test that old config format still works"""
-        # This represents a config from version 0.1.0
-        legacy_config = """
+
+def _load(f):
+    """Parse YAML with the libyaml safe loader when available"""
+    return yaml.load(f, Loader=_SafeLoader)
+
+
+# These are the action types users have in their configs
+EXPECTED_ACTION_TYPES = frozenset({"command", "application", "page", "url"})
+
+# This represents a config from version 0.1.0
+LEGACY_CONFIG_STR = """
 device:
   brightness: 75
 
@@ -41,12 +45,85 @@ pages:
           type: url
           url: "https://example.com"
 """
-        config_file = tmp_path / "legacy.yaml"
-        config_file.write_text(legacy_config)
+LEGACY_CONFIG = {
+    "device": {"brightness": 75},
+    "styles": {
+        "default": {
+            "font": "DejaVu Sans",
+            "font_size": 14,
+            "text_color": "#FFFFFF",
+            "background_color": "#000000",
+        },
+    },
+    "pages": {
+        "main": {
+            "name": "Main",
+            "buttons": {
+                1: {"text": "Test", "action": {"type": "command", "command": "echo test"}},
+                2: {"icon": "test.png", "action": {"type": "url", "url": "https://example.com"}},
+            },
+        },
+    },
+}
+
+MINIMAL_CONFIG = {
+    "pages": {
+        "main": {
+            "buttons": {
+                1: {"text": "Test", "action": {"type": "command", "command": "echo test"}},
+            },
+        },
+    },
+}
+
+STYLES_CONFIG = {
+    "styles": {
+        "default": {
+            "font": "DejaVu Sans",
+            "font_size": 14,
+            "text_color": "#FFFFFF",
+            "background_color": "#000000",
+        },
+        "custom": {
+            "font": "Custom Font",
+            "font_size": 12,
+            "text_color": "#FF0000",
+            "background_color": "#00FF00",
+            # New properties should be optional
+            "text_align": "center",
+            "text_offset": 5,
+        },
+    },
+}
+
+_TEST_COMMAND = {"type": "command", "command": "test"}
+
+BUTTON_FORMATS = {
+    "pages": {
+        "main": {
+            "buttons": {
+                # Text only button (original)
+                1: {"text": "Text Only", "action": _TEST_COMMAND},
+                # Icon only button
+                2: {"icon": "icon.png", "action": _TEST_COMMAND},
+                # Icon with label overlay (newer)
+                3: {"icon": "icon.png", "label": "Label", "action": _TEST_COMMAND},
+                # Animated GIF support
+                4: {"icon": "animated.gif", "action": _TEST_COMMAND},
+                # Style reference
+                5: {"text": "Styled", "style": "custom", "action": _TEST_COMMAND},
+            },
+        },
+    },
+}
 
-        # Load and validate config
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
+
+class TestConfigurationCompatibility:
+    """Test that configuration format remains backward compatible"""
+
+    def test_legacy_config_format(self):
+        """Test that old config format still works"""
+        config = LEGACY_CONFIG
 
         # Essential structure should be present
         assert "device" in config
@@ -58,23 +135,28 @@ pages:
         assert config["pages"]["main"]["buttons"][1]["action"]["type"] == "command"
         assert config["pages"]["main"]["buttons"][2]["action"]["type"] == "url"
 
-    def test_new_config_features_optional(self, tmp_path):
-        """Test that new features are optional and don't break old configs"""
-        minimal_config = """
-pages:
-  main:
-    buttons:
-      1:
-        text: "Test"
-        action:
-          type: command
-          command: "echo test"
-"""
-        config_file = tmp_path / "minimal.yaml"
-        config_file.write_text(minimal_config)
+    def test_legacy_config_file_round_trip(self, tmp_path):
+        """Test that a legacy config file on disk parses to the same structure"""
+        config_file = tmp_path / "legacy.yaml"
+        config_file.write_text(LEGACY_CONFIG_STR)
+
+        with open(config_file) as f:
+            assert _load(f) == LEGACY_CONFIG
+
+    @pytest.mark.parametrize(
+        "config", [LEGACY_CONFIG, MINIMAL_CONFIG, STYLES_CONFIG, BUTTON_FORMATS]
+    )
+    def test_yaml_round_trip(self, config, tmp_path):
+        """Test that expected configs survive a YAML dump and reload unchanged"""
+        config_file = tmp_path / "round_trip.yaml"
+        config_file.write_text(yaml.safe_dump(config))
 
         with open(config_file) as f:
-            config = yaml.safe_load(f)
+            assert _load(f) == config
+
+    def test_new_config_features_optional(self):
+        """Test that new features are optional and don't break old configs"""
+        config = MINIMAL_CONFIG
 
         # Config should load without device or styles sections
         assert "pages" in config
@@ -86,43 +168,15 @@ pages:
 
     def test_action_type_names_unchanged(self):
         """Ensure action type names haven't changed"""
-        # These are the action types users have in their configs
-        expected_action_types = [
-            "command",
-            "application",
-            "page",
-            "url",
-        ]
-
-        # In the real implementation, we'd check against the registry
-        # For now, we document the expected types
-        for action_type in expected_action_types:
-            # This would verify the action is registered
-            assert action_type in expected_action_types
-
-    def test_style_properties_backward_compatible(self, tmp_path):
-        """Test style properties remain compatible"""
-        config_with_styles = """
-styles:
-  default:
-    font: "DejaVu Sans"
-    font_size: 14
-    text_color: "#FFFFFF"
-    background_color: "#000000"
-  custom:
-    font: "Custom Font"
-    font_size: 12
-    text_color: "#FF0000"
-    background_color: "#00FF00"
-    # New properties should be optional
-    text_align: "center"
-    text_offset: 5
-"""
-        config_file = tmp_path / "styles.yaml"
-        config_file.write_text(config_with_styles)
+        registry = ActionRegistry()
+        registry.auto_discover()
 
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
+        # Every type users already have in their configs must still be registered
+        assert EXPECTED_ACTION_TYPES <= frozenset(registry.list_actions())
+
+    def test_style_properties_backward_compatible(self):
+        """Test style properties remain compatible"""
+        config = STYLES_CONFIG
 
         # Old properties still work
         assert config["styles"]["default"]["font"] == "DejaVu Sans"
@@ -132,56 +186,9 @@ styles:
         assert "text_align" not in config["styles"]["default"]  # Not required
         assert config["styles"]["custom"]["text_align"] == "center"  # But can be used
 
-    def test_button_config_formats(self, tmp_path):
+    def test_button_config_formats(self):
         """Test various button configuration formats remain valid"""
-        button_formats = """
-pages:
-  main:
-    buttons:
-      # Text only button (original)
-      1:
-        text: "Text Only"
-        action:
-          type: command
-          command: "test"
-
-      # Icon only button
-      2:
-        icon: "icon.png"
-        action:
-          type: command
-          command: "test"
-
-      # Icon with label overlay (newer)
-      3:
-        icon: "icon.png"
-        label: "Label"
-        action:
-          type: command
-          command: "test"
-
-      # Animated GIF support
-      4:
-        icon: "animated.gif"
-        action:
-          type: command
-          command: "test"
-
-      # Style reference
-      5:
-        text: "Styled"
-        style: "custom"
-        action:
-          type: command
-          command: "test"
-"""
-        config_file = tmp_path / "buttons.yaml"
-        config_file.write_text(button_formats)
-
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
-
-        buttons = config["pages"]["main"]["buttons"]
+        buttons = BUTTON_FORMATS["pages"]["main"]["buttons"]
 
         # All button formats should be valid
         assert buttons[1]["text"] == "Text Only"
@@ -8,373 +8,258 @@ These tests verify the controller's behavior in real-world scenarios including:
 - Graceful shutdown
 """
 
-import threading
+import os
 import time
-from unittest.mock import MagicMock, Mock, PropertyMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+import decky.config.loader as loader_module
 from decky.controller import DeckyController
 
+# Fail hung threaded tests quickly instead of stalling the whole run
+pytestmark = pytest.mark.timeout(10)
 
+
+@pytest.mark.usefixtures("fast_intervals")
 class TestMainLoopReconnection:
     """Test main loop reconnection logic"""
 
-    @pytest.fixture
-    def mock_deck(self):
-        """Create a mock Stream Deck device"""
-        deck = MagicMock()
-        deck.deck_type.return_value = "Stream Deck"
-        deck.key_count.return_value = 15
-        deck.key_image_format.return_value = {
-            "size": (72, 72),
-            "format": "JPEG",
-            "rotation": 0,
-            "mirror": (False, False),
-            "flip": (False, False),
-        }
-        deck.is_visual.return_value = True
-        deck.set_brightness = MagicMock()
-        deck.set_key_callback = MagicMock()
-        deck.set_key_image = MagicMock()
-        deck.reset = MagicMock()
-        deck.close = MagicMock()
-        deck.open = MagicMock()
-        return deck
-
-    @pytest.fixture
-    def mock_config(self, tmp_path):
-        """Create a minimal test configuration"""
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(
-            """
-device:
-  brightness: 75
-
-styles:
-  default:
-    font: DejaVu Sans
-    font_size: 14
-    text_color: '#FFFFFF'
-    background_color: '#000000'
-
-pages:
-  main:
-    name: Main
-    buttons:
-      1:
-        text: Test
-        action:
-          type: command
-          command: echo test
-"""
-        )
-        return str(config_file)
-
-    def test_controller_starts_without_device(self, mock_config):
+    def test_controller_starts_without_device(
+        self, mock_manager, mock_config, run_controller, stop_controller
+    ):
         """Test that controller starts successfully even when no device is connected"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            # No devices available
-            mock_manager.return_value.enumerate.return_value = []
+        # No devices available
+        mock_manager.return_value.enumerate.return_value = []
 
-            controller = DeckyController(mock_config)
+        controller = DeckyController(mock_config)
 
-            # Start controller in a thread
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        # Start controller in a thread
+        run_future = run_controller(controller)
 
-            # Let it run briefly
-            time.sleep(0.5)
+        # Let it run briefly
+        time.sleep(0.1)
 
-            # Should be running without a deck
-            assert controller.running is True
-            assert controller.deck is None
+        # Should be running without a deck
+        assert controller.running is True
+        assert controller.deck is None
 
-            # Shutdown gracefully
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        stop_controller(controller, run_future)
 
-            assert not run_thread.is_alive()
+        assert run_future.done()
 
-    def test_device_reconnection_after_disconnect(self, mock_config, mock_deck):
+    def test_device_reconnection_after_disconnect(self, mock_manager, mock_config, mock_deck, step):
         """Test that controller reconnects when device becomes available"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            enumerate_results = [
-                [],  # Initially no device
-                [],  # Still no device
-                [mock_deck],  # Device appears
-            ]
-            mock_manager.return_value.enumerate.side_effect = enumerate_results
-
-            controller = DeckyController(mock_config)
-
-            # Start controller
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
-
-            # Initially no device
-            time.sleep(0.2)
+        enumerate_results = [
+            [],  # Initially no device
+            [],  # Still no device
+            [mock_deck],  # Device appears
+        ]
+        mock_manager.return_value.enumerate.side_effect = enumerate_results
+
+        controller = DeckyController(mock_config)
+        controller.load_config()
+
+        # Step the loop once per enumerate result
+        for tick in range(1, len(enumerate_results) + 1):
             assert controller.deck is None
+            step(controller, tick)
 
-            # Wait for reconnection attempts (should try after 2 seconds)
-            time.sleep(2.5)
-
-            # Device should be connected now
-            assert controller.deck is not None
-            assert controller.deck == mock_deck
-
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        # Device should be connected now
+        assert controller.deck is mock_deck
 
-    def test_device_hot_unplug_detection(self, mock_config, mock_deck):
+    def test_device_hot_unplug_detection(
+        self, mock_manager, mock_config, mock_deck, run_controller, stop_controller, wait_for_state
+    ):
         """Test detection of device being unplugged during operation"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-            controller = DeckyController(mock_config)
-            controller.load_config()
-            controller.connect()
+        controller = DeckyController(mock_config)
 
-            # Device is connected
-            assert controller.deck is not None
+        # Start the run loop and wait for its initial connection
+        run_future = run_controller(controller)
+        assert wait_for_state(controller, lambda: controller.deck is mock_deck)
 
-            # Start the run loop
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        # Simulate device being unplugged:
+        # 1. connected() reports False (no longer enumerated by HID)
+        # 2. enumerate returns empty (device no longer available)
+        mock_deck.connected.return_value = False
+        mock_manager.return_value.enumerate.return_value = []
 
-            # Give it a moment to start running
-            time.sleep(0.2)
+        # Wait for disconnect detection
+        assert wait_for_state(controller, lambda: controller.deck is None)
 
-            # Simulate device being unplugged:
-            # 1. is_visual raises OSError (device no longer responding)
-            # 2. enumerate returns empty (device no longer available)
-            mock_deck.is_visual.side_effect = OSError("Device disconnected")
-            mock_manager.return_value.enumerate.return_value = []
+        # Device should be detected as disconnected and NOT reconnected
+        assert controller.deck is None
 
-            # Wait for disconnect detection (checks every 0.5s, give it time for 2-3 checks)
-            time.sleep(1.5)
+        stop_controller(controller, run_future)
 
-            # Device should be detected as disconnected and NOT reconnected
-            assert controller.deck is None
-
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
-
-    def test_no_reconnection_during_shutdown(self, mock_config, mock_deck):
+    def test_no_reconnection_during_shutdown(self, mock_manager, mock_config, mock_deck, step):
         """Test that reconnection doesn't happen during shutdown"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            # No device available initially, but becomes available later
-            # However shutting_down should prevent reconnection
-            mock_manager.return_value.enumerate.side_effect = [
-                [],  # No device initially
-                [mock_deck],  # Device becomes available (but shouldn't reconnect)
-                [mock_deck],  # Still available
-            ]
-
-            controller = DeckyController(mock_config)
-            controller.load_config()
-
-            # Set shutting_down flag BEFORE running to prevent reconnection
-            controller.shutting_down = True
-
-            # Start run loop
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
-
-            # Wait long enough for multiple reconnection attempts (reconnect interval is 2s)
-            time.sleep(2.5)
-
-            # Should not have connected despite device becoming available
-            # (because shutting_down prevents reconnection)
-            assert controller.deck is None
-
-            # Cleanup
-            controller.running = False
-            run_thread.join(timeout=2)
-
-    def test_screen_lock_disconnects_device(self, mock_config, mock_deck):
+        # No device available initially, but becomes available later
+        # However shutting_down should prevent reconnection
+        mock_manager.return_value.enumerate.side_effect = [
+            [],  # No device initially
+            [mock_deck],  # Device becomes available (but shouldn't reconnect)
+            [mock_deck],  # Still available
+        ]
+
+        controller = DeckyController(mock_config)
+        controller.load_config()
+
+        # Set shutting_down flag BEFORE stepping to prevent reconnection
+        controller.shutting_down = True
+
+        # Simulate time for several reconnection intervals
+        for tick in range(1, 4):
+            step(controller, tick)
+
+        # Should not have connected despite device becoming available
+        # (because shutting_down prevents reconnection)
+        assert controller.deck is None
+        mock_manager.return_value.enumerate.assert_not_called()
+
+    def test_screen_lock_disconnects_device(
+        self,
+        mock_manager,
+        mock_config,
+        mock_deck,
+        lockable_platform,
+        run_controller,
+        stop_controller,
+        wait_for_state,
+    ):
         """Test that device is disconnected when screen is locked"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-            # Create controller with mock platform
-            with patch("decky.controller.detect_platform") as mock_platform_detect:
-                mock_platform = MagicMock()
-                mock_platform.name = "test"
-                mock_platform.is_screen_locked.return_value = False
-                mock_platform_detect.return_value = mock_platform
+        controller = DeckyController(mock_config)
 
-                controller = DeckyController(mock_config)
-                controller.load_config()
-                controller.connect()
+        # Start run loop and wait for its initial connection
+        run_future = run_controller(controller)
+        assert wait_for_state(controller, lambda: controller.deck is mock_deck)
 
-                # Device connected
-                assert controller.deck is not None
+        # Simulate screen lock
+        lockable_platform.locked = True
 
-                # Start run loop
-                run_thread = threading.Thread(target=controller.run, daemon=True)
-                run_thread.start()
+        # Wait for lock detection
+        assert wait_for_state(controller, lambda: controller.is_locked and controller.deck is None)
 
-                time.sleep(0.5)
+        # Device should be disconnected
+        assert controller.deck is None
+        assert controller.is_locked is True
 
-                # Simulate screen lock
-                mock_platform.is_screen_locked.return_value = True
+        stop_controller(controller, run_future)
 
-                # Wait for lock detection
-                time.sleep(1.5)
+    def test_graceful_shutdown_on_sigterm(
+        self, mock_manager, mock_config, mock_deck, run_controller, stop_controller
+    ):
+        """Test graceful shutdown when receiving SIGTERM"""
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-                # Device should be disconnected
-                assert controller.deck is None
-                assert controller.is_locked is True
+        controller = DeckyController(mock_config)
+        controller.load_config()
+        controller.connect()
 
-                # Cleanup
-                controller.running = False
-                controller.shutting_down = True
-                run_thread.join(timeout=2)
+        assert controller.deck is not None
 
-    def test_graceful_shutdown_on_sigterm(self, mock_config, mock_deck):
-        """Test graceful shutdown when receiving SIGTERM"""
-        import signal
+        # Start run loop
+        run_future = run_controller(controller)
 
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        time.sleep(0.1)
 
-            controller = DeckyController(mock_config)
-            controller.load_config()
-            controller.connect()
+        # Trigger shutdown and wait for the loop to exit
+        stop_controller(controller, run_future)
 
-            assert controller.deck is not None
+        # Verify clean shutdown
+        assert run_future.done()
+        # Device should be disconnected
+        mock_deck.reset.assert_called()
+        mock_deck.close.assert_called()
 
-            # Start run loop
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+    def test_animation_updates_in_main_loop(
+        self, mock_manager, mock_config, mock_deck, run_controller, stop_controller
+    ):
+        """Test that animated buttons are updated in the main loop"""
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
+
+        controller = DeckyController(mock_config)
+        controller.load_config()
+        controller.connect()
+
+        # Add a fake animated button
+        controller.animated_buttons[0] = {
+            "frames": [MagicMock(), MagicMock()],
+            "durations_ns": [100_000_000, 100_000_000],
+            "current_frame": 0,
+            "last_update_ns": time.monotonic_ns() - 1_000_000_000,  # Old update
+            "config": {"text": "Test"},
+        }
 
-            time.sleep(0.3)
+        # Start run loop briefly
+        run_future = run_controller(controller)
 
-            # Trigger shutdown
-            controller.running = False
-            controller.shutting_down = True
+        # Let animations run
+        time.sleep(0.1)
 
-            # Wait for clean shutdown
-            run_thread.join(timeout=3)
+        # Check that animation was processed (frame advanced or image set)
+        # We can't easily check frame advancement without more mocking,
+        # but we verify the loop ran
+        assert controller.running is True
 
-            # Verify clean shutdown
-            assert not run_thread.is_alive()
-            # Device should be disconnected
-            mock_deck.reset.assert_called()
-            mock_deck.close.assert_called()
+        stop_controller(controller, run_future)
 
-    def test_animation_updates_in_main_loop(self, mock_config, mock_deck):
-        """Test that animated buttons are updated in the main loop"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
-
-            controller = DeckyController(mock_config)
-            controller.load_config()
-            controller.connect()
-
-            # Add a fake animated button
-            controller.animated_buttons[0] = {
-                "frames": [MagicMock(), MagicMock()],
-                "durations": [100, 100],
-                "current_frame": 0,
-                "last_update": time.time() - 1.0,  # Old update
-                "config": {"text": "Test"},
-            }
-
-            # Start run loop briefly
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
-
-            # Let animations run
-            time.sleep(0.3)
-
-            # Check that animation was processed (frame advanced or image set)
-            # We can't easily check frame advancement without more mocking,
-            # but we verify the loop ran
-            assert controller.running is True
-
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
-
-    def test_config_reload_capability(self, mock_config, mock_deck):
+    def test_config_reload_capability(
+        self, mock_manager, mock_config, parsed_mock_config, mock_deck
+    ):
         """Test that configuration can be reloaded while running"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-            controller = DeckyController(mock_config)
-            assert controller.load_config() is True
+        controller = DeckyController(mock_config)
+        assert controller.load_config() is True
 
-            # Config should be loaded
-            assert controller.config is not None
-            assert "pages" in controller.config
+        # Config should be loaded
+        assert controller.config is not None
+        assert "pages" in controller.config
+        first_config = controller.config
 
-            # Should be able to reload
-            assert controller.load_config() is True
+        # Should be able to reload
+        assert controller.load_config() is True
+        assert controller.config["device"] == parsed_mock_config["device"]
 
-    def test_multiple_reconnection_attempts(self, mock_config, mock_deck):
-        """Test that multiple reconnection attempts work correctly"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            # Device not available for first few attempts, then appears
-            enumerate_results = [
-                [],  # Attempt 1
-                [],  # Attempt 2
-                [],  # Attempt 3
-                [mock_deck],  # Attempt 4 - success
-            ]
-            mock_manager.return_value.enumerate.side_effect = enumerate_results
+        # Unchanged file content reuses the parsed config as an independent copy
+        assert controller.config == first_config
+        assert controller.config is not first_config
 
-            controller = DeckyController(mock_config)
+    def test_multiple_reconnection_attempts(self, mock_manager, mock_config, mock_deck, step):
+        """Test that multiple reconnection attempts work correctly"""
+        # Device not available for first few attempts, then appears
+        enumerate_results = [
+            [],  # Attempt 1
+            [],  # Attempt 2
+            [],  # Attempt 3
+            [mock_deck],  # Attempt 4 - success
+        ]
+        mock_manager.return_value.enumerate.side_effect = enumerate_results
 
-            # Start controller
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        controller = DeckyController(mock_config)
+        controller.load_config()
+        enumerate_mock = mock_manager.return_value.enumerate
 
-            # Wait long enough for multiple reconnection attempts
-            # (reconnection interval is 2 seconds)
-            time.sleep(7.0)
+        for attempt in range(1, len(enumerate_results) + 1):
+            step(controller, attempt)
+            assert enumerate_mock.call_count == attempt
 
-            # Should be connected after several attempts
-            assert controller.deck is not None
+            # A second tick at the same instant is throttled
+            step(controller, attempt)
+            assert enumerate_mock.call_count == attempt
 
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        # Should be connected after several attempts
+        assert controller.deck is mock_deck
 
 
 class TestMainLoopEdgeCases:
     """Test edge cases and error conditions in main loop"""
 
-    @pytest.fixture
-    def mock_config(self, tmp_path):
-        """Create a minimal test configuration"""
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(
-            """
-device:
-  brightness: 75
-
-pages:
-  main:
-    name: Main
-    buttons:
-      1:
-        text: Test
-        action:
-          type: command
-          command: echo test
-"""
-        )
-        return str(config_file)
-
     def test_invalid_config_prevents_startup(self, tmp_path):
         """Test that invalid config prevents controller from running"""
         bad_config = tmp_path / "bad_config.yaml"
@@ -395,17 +280,70 @@ pages:
         # Should handle gracefully
         assert controller.load_config() is False
 
-    def test_controller_handles_deck_errors_gracefully(self, mock_config):
+    def test_config_reload_picks_up_changes(self, tmp_path):
+        """Test that reloading a modified config file parses the new content"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("pages:\n  main:\n    buttons: {}\n")
+
+        controller = DeckyController(str(config_file))
+        assert controller.load_config() is True
+        assert controller.config["device"]["brightness"] == 100
+
+        config_file.write_text("device:\n  brightness: 40\npages:\n  main:\n    buttons: {}\n")
+        assert controller.load_config() is True
+        assert controller.config["device"]["brightness"] == 40
+
+    def test_config_reload_detects_same_size_edit_with_same_mtime(self, tmp_path):
+        """Test that an edit invisible to file metadata is still picked up"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("device:\n  brightness: 40\npages:\n  main:\n    buttons: {}\n")
+
+        controller = DeckyController(str(config_file))
+        assert controller.load_config() is True
+        stat = config_file.stat()
+
+        # Same size, mtime restored as on a coarse-timestamp filesystem
+        config_file.write_text("device:\n  brightness: 60\npages:\n  main:\n    buttons: {}\n")
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert controller.load_config() is True
+        assert controller.config["device"]["brightness"] == 60
+
+    def test_config_parsed_once_across_controllers(self, tmp_path, monkeypatch):
+        """Test that controllers loading the same file share one parse but not one dict"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("pages:\n  main:\n    buttons: {}\n")
+
+        parses = []
+        yaml_load = loader_module.yaml.load
+        monkeypatch.setattr(
+            loader_module.yaml,
+            "load",
+            lambda *args, **kwargs: parses.append(args) or yaml_load(*args, **kwargs),
+        )
+
+        first = DeckyController(str(config_file))
+        second = DeckyController(str(config_file))
+        assert first.load_config() is True
+        assert second.load_config() is True
+
+        assert len(parses) == 1
+        assert first.config == second.config
+
+        # Each controller owns its config; changing one leaves the other intact
+        first.config["device"]["brightness"] = 10
+        assert second.config["device"]["brightness"] == 100
+
+    def test_controller_handles_deck_errors_gracefully(self, mock_manager, mock_config):
         """Test that controller handles deck errors without crashing"""
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_deck = MagicMock()
-            mock_deck.open.side_effect = Exception("USB error")
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        mock_deck = MagicMock()
+        mock_deck.open.side_effect = Exception("USB error")
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-            controller = DeckyController(mock_config)
-            controller.load_config()
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-            # Connection should fail gracefully
-            result = controller.connect()
-            assert result is False
-            assert controller.deck is None
+        # Connection should fail gracefully
+        result = controller.connect()
+        assert result is False
+        assert controller.deck is None
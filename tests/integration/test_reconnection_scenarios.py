@@ -8,208 +8,120 @@ These tests verify the controller correctly handles:
 - Reconnection timing and throttling
 """
 
-import threading
-import time
-from unittest.mock import MagicMock, patch
-
 import pytest
 
 from decky.controller import DeckyController
+from decky.managers import ConnectionManager
+
+# Fail hung threaded tests quickly instead of stalling the whole run, and
+# compress monitor intervals for every scenario
+pytestmark = [pytest.mark.timeout(10), pytest.mark.usefixtures("fast_intervals")]
 
 
 class TestUSBHotPlug:
     """Test USB hot-plug scenarios"""
 
-    @pytest.fixture
-    def mock_config(self, tmp_path):
-        """Create a minimal test configuration"""
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(
-            """
-device:
-  brightness: 75
-
-pages:
-  main:
-    name: Main
-    buttons:
-      1:
-        text: Test
-        action:
-          type: command
-          command: echo test
-"""
-        )
-        return str(config_file)
-
-    @pytest.fixture
-    def mock_deck(self):
-        """Create a mock Stream Deck device"""
-        deck = MagicMock()
-        deck.deck_type.return_value = "Stream Deck"
-        deck.key_count.return_value = 15
-        deck.key_image_format.return_value = {
-            "size": (72, 72),
-            "format": "JPEG",
-            "rotation": 0,
-            "mirror": (False, False),
-            "flip": (False, False),
-        }
-        deck.is_visual.return_value = True
-        deck.set_brightness = MagicMock()
-        deck.set_key_callback = MagicMock()
-        deck.set_key_image = MagicMock()
-        deck.reset = MagicMock()
-        deck.close = MagicMock()
-        deck.open = MagicMock()
-        return deck
-
-    def test_device_plugged_in_after_startup(self, mock_config, mock_deck):
+    def test_device_plugged_in_after_startup(
+        self, mock_manager, mock_config, mock_deck, run_controller, stop_controller, wait_for_state
+    ):
         """
         Test scenario: Decky starts with no device, then device is plugged in.
         Expected: Controller detects and connects to the device.
         """
-        call_count = 0
+        call_count = [0]
 
         def enumerate_side_effect():
-            nonlocal call_count
-            call_count += 1
+            call_count[0] += 1
             # Return empty list for first 2 calls, then return device
-            if call_count <= 2:
+            if call_count[0] <= 2:
                 return []
             return [mock_deck]
 
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.side_effect = enumerate_side_effect
+        mock_manager.return_value.enumerate.side_effect = enumerate_side_effect
 
-            controller = DeckyController(mock_config)
+        controller = DeckyController(mock_config)
 
-            # Start without device
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        # Start without device
+        run_future = run_controller(controller)
 
-            # Initially no device
-            time.sleep(0.3)
-            assert controller.deck is None
+        # Initially no device
+        assert controller.deck is None
 
-            # Wait for reconnection cycle (2 second interval)
-            time.sleep(5.0)
+        # Wait for reconnection cycle
+        assert wait_for_state(controller, lambda: controller.deck is not None)
 
-            # Device should now be connected
-            assert controller.deck is not None
-            assert controller.deck == mock_deck
+        # Device should now be connected
+        assert controller.deck is not None
+        assert controller.deck == mock_deck
 
-            # Verify device was initialized
-            mock_deck.set_brightness.assert_called()
-            mock_deck.set_key_callback.assert_called()
+        # Verify device was initialized
+        mock_deck.set_brightness.assert_called()
+        mock_deck.set_key_callback.assert_called()
 
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        stop_controller(controller, run_future)
 
-    def test_device_unplugged_during_operation(self, mock_config, mock_deck):
+    def test_device_unplugged_during_operation(self, mock_manager, mock_config, mock_deck, step):
         """
         Test scenario: Device is running normally, then gets unplugged.
         Expected: Controller detects disconnection and cleans up.
         """
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
-
-            controller = DeckyController(mock_config)
-            controller.load_config()
-            controller.connect()
-
-            # Device is connected
-            assert controller.deck is not None
-            mock_deck.reset.reset_mock()
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-            # Start running
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        controller = DeckyController(mock_config)
+        controller.load_config()
+        controller.connect()
 
-            # Give it time to start running
-            time.sleep(0.3)
+        # Device is connected and stays connected while healthy
+        step(controller, 1)
+        assert controller.deck is mock_deck
 
-            # Simulate device being unplugged:
-            # 1. is_visual raises OSError (device no longer responding)
-            # 2. enumerate returns empty (device no longer available for reconnection)
-            mock_deck.is_visual.side_effect = OSError("Device not found")
-            mock_manager.return_value.enumerate.return_value = []
-
-            # Wait for disconnection detection (checks every 0.5s, wait for 2-3 checks)
-            time.sleep(1.5)
-
-            # Controller should detect and handle disconnection
-            assert controller.deck is None
+        # Simulate device being unplugged:
+        # 1. connected() reports False (no longer enumerated by HID)
+        # 2. enumerate returns empty (device no longer available for reconnection)
+        mock_deck.connected.return_value = False
+        mock_manager.return_value.enumerate.return_value = []
+        step(controller, 2)
 
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        # Controller should detect and handle disconnection
+        assert controller.deck is None
+        mock_deck.close.assert_called_once()
 
-    def test_multiple_unplug_replug_cycles(self, mock_config, mock_deck):
+    def test_multiple_unplug_replug_cycles(self, mock_manager, mock_config, mock_deck, step):
         """
         Test scenario: Device is unplugged and re-plugged multiple times.
         Expected: Controller handles each cycle correctly.
         """
         is_connected = [True]  # Mutable container for state
-        enumerate_call_count = [0]
 
         def enumerate_side_effect():
-            enumerate_call_count[0] += 1
             # Alternate between connected and disconnected
             if is_connected[0]:
                 return [mock_deck]
             return []
 
-        def is_visual_side_effect():
-            if not is_connected[0]:
-                raise OSError("Device disconnected")
-            return True
+        def connected_side_effect():
+            return is_connected[0]
 
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.side_effect = enumerate_side_effect
-            mock_deck.is_visual.side_effect = is_visual_side_effect
+        mock_manager.return_value.enumerate.side_effect = enumerate_side_effect
+        mock_deck.connected.side_effect = connected_side_effect
 
-            controller = DeckyController(mock_config)
-            controller.load_config()
-            controller.connect()
+        controller = DeckyController(mock_config)
+        controller.load_config()
+        controller.connect()
 
-            # Initially connected
-            assert controller.deck is not None
+        # Initially connected
+        assert controller.deck is not None
 
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        # Unplug, replug, unplug again - one simulated tick per state change
+        for tick, plugged in enumerate([False, True, False], start=1):
+            is_connected[0] = plugged
+            step(controller, tick)
+            assert (controller.deck is mock_deck) is plugged
 
-            time.sleep(0.5)
-
-            # Cycle 1: Unplug
-            is_connected[0] = False
-            time.sleep(1.5)
-            assert controller.deck is None
-
-            # Cycle 1: Replug
-            is_connected[0] = True
-            mock_deck.is_visual.side_effect = is_visual_side_effect  # Reset
-            time.sleep(2.5)
-            assert controller.deck is not None
-
-            # Cycle 2: Unplug again
-            is_connected[0] = False
-            mock_deck.is_visual.side_effect = is_visual_side_effect  # Reset
-            time.sleep(1.5)
-            assert controller.deck is None
-
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
-
-    def test_reconnection_throttling(self, mock_config):
+    def test_reconnection_throttling(self, mock_manager, mock_config, monkeypatch):
         """
         Test that reconnection attempts are throttled to avoid USB spam.
-        Expected: Reconnection attempts limited to every 2 seconds.
+        Expected: One reconnection attempt per reconnect interval.
         """
         enumerate_count = [0]
 
@@ -217,292 +129,142 @@ pages:
             enumerate_count[0] += 1
             return []  # No device available
 
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.side_effect = count_enumerate
-
-            controller = DeckyController(mock_config)
+        # Exact binary fractions keep the simulated clock arithmetic exact
+        monkeypatch.setattr(ConnectionManager, "RECONNECT_INTERVAL", 1.0)
+        monkeypatch.setattr(ConnectionManager, "CONNECTION_CHECK_INTERVAL", 0.25)
 
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        mock_manager.return_value.enumerate.side_effect = count_enumerate
 
-            # Run for 5 seconds
-            time.sleep(5.0)
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-            # Should have attempted reconnection ~2-3 times (every 2 seconds)
-            # Allow some variance for timing
-            assert 1 <= enumerate_count[0] <= 4
+        # Tick every 0.25s of simulated time for 5 seconds
+        for tick in range(1, 21):
+            controller.connection_manager._monitor_once(current_time=tick * 0.25)
 
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        # Exactly one attempt per elapsed reconnect interval
+        assert enumerate_count[0] == 5
 
 
 class TestReconnectionWithScreenLock:
     """Test reconnection behavior with screen locking"""
 
-    @pytest.fixture
-    def mock_config(self, tmp_path):
-        """Create a minimal test configuration"""
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(
-            """
-device:
-  brightness: 75
-
-pages:
-  main:
-    name: Main
-    buttons:
-      1:
-        text: Test
-        action:
-          type: command
-          command: echo test
-"""
-        )
-        return str(config_file)
-
-    @pytest.fixture
-    def mock_deck(self):
-        """Create a mock Stream Deck device"""
-        deck = MagicMock()
-        deck.deck_type.return_value = "Stream Deck"
-        deck.key_count.return_value = 15
-        deck.key_image_format.return_value = {
-            "size": (72, 72),
-            "format": "JPEG",
-            "rotation": 0,
-            "mirror": (False, False),
-            "flip": (False, False),
-        }
-        deck.is_visual.return_value = True
-        deck.set_brightness = MagicMock()
-        deck.set_key_callback = MagicMock()
-        deck.set_key_image = MagicMock()
-        deck.reset = MagicMock()
-        deck.close = MagicMock()
-        return deck
-
-    def test_no_reconnection_while_screen_locked(self, mock_config, mock_deck):
+    def test_no_reconnection_while_screen_locked(
+        self, mock_manager, mock_config, mock_deck, lockable_platform, step
+    ):
         """
         Test scenario: Screen is locked, device becomes available.
         Expected: Controller does NOT reconnect while locked.
         """
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
+        lockable_platform.locked = True  # Locked!
 
-            with patch("decky.controller.detect_platform") as mock_platform_detect:
-                mock_platform = MagicMock()
-                mock_platform.name = "test"
-                mock_platform.is_screen_locked.return_value = True  # Locked!
-                mock_platform_detect.return_value = mock_platform
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-                controller = DeckyController(mock_config)
+        # First tick may connect before the lock is noticed, then drops the device
+        step(controller, 1)
+        attempts = mock_manager.return_value.enumerate.call_count
 
-                run_thread = threading.Thread(target=controller.run, daemon=True)
-                run_thread.start()
+        # Several more reconnect intervals pass while locked
+        for tick in range(2, 5):
+            step(controller, tick)
 
-                # Wait for lock detection
-                time.sleep(2.0)
+        # Should NOT connect while locked
+        assert controller.deck is None
+        assert controller.is_locked is True
+        assert mock_manager.return_value.enumerate.call_count == attempts
 
-                # Should NOT connect while locked
-                assert controller.deck is None
-                assert controller.is_locked is True
-
-                # Cleanup
-                controller.running = False
-                controller.shutting_down = True
-                run_thread.join(timeout=2)
-
-    def test_reconnection_after_unlock(self, mock_config, mock_deck):
+    def test_reconnection_after_unlock(
+        self, mock_manager, mock_config, mock_deck, lockable_platform, step
+    ):
         """
         Test scenario: Screen locked, then unlocked.
         Expected: Controller reconnects after unlock.
         """
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
-
-            with patch("decky.controller.detect_platform") as mock_platform_detect:
-                mock_platform = MagicMock()
-                mock_platform.name = "test"
-                is_locked = [True]  # Mutable container
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
+        lockable_platform.locked = True
 
-                def check_lock():
-                    return is_locked[0]
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-                mock_platform.is_screen_locked.side_effect = check_lock
-                mock_platform_detect.return_value = mock_platform
+        # Initially locked
+        step(controller, 1)
+        assert controller.is_locked is True
+        assert controller.deck is None
 
-                controller = DeckyController(mock_config)
+        # Unlock screen
+        lockable_platform.locked = False
+        step(controller, 2)
 
-                run_thread = threading.Thread(target=controller.run, daemon=True)
-                run_thread.start()
+        # Should reconnect after unlock
+        assert controller.is_locked is False
+        assert controller.deck is mock_deck
 
-                # Initially locked
-                time.sleep(1.5)
-                assert controller.is_locked is True
-                assert controller.deck is None
-
-                # Unlock screen
-                is_locked[0] = False
-
-                # Wait for unlock detection and reconnection
-                time.sleep(2.0)
-
-                # Should reconnect after unlock
-                assert controller.is_locked is False
-                assert controller.deck is not None
-
-                # Cleanup
-                controller.running = False
-                controller.shutting_down = True
-                run_thread.join(timeout=2)
-
-    def test_lock_unlock_multiple_cycles(self, mock_config, mock_deck):
+    def test_lock_unlock_multiple_cycles(
+        self, mock_manager, mock_config, mock_deck, lockable_platform, step
+    ):
         """
         Test scenario: Multiple lock/unlock cycles.
         Expected: Controller disconnects on lock, reconnects on unlock.
         """
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.return_value = [mock_deck]
-
-            with patch("decky.controller.detect_platform") as mock_platform_detect:
-                mock_platform = MagicMock()
-                mock_platform.name = "test"
-                is_locked = [False]
-
-                def check_lock():
-                    return is_locked[0]
-
-                mock_platform.is_screen_locked.side_effect = check_lock
-                mock_platform_detect.return_value = mock_platform
-
-                controller = DeckyController(mock_config)
-                controller.load_config()
-
-                run_thread = threading.Thread(target=controller.run, daemon=True)
-                run_thread.start()
-
-                # Start unlocked - should connect
-                time.sleep(1.0)
-                assert controller.deck is not None
-
-                # Lock screen
-                is_locked[0] = True
-                time.sleep(1.5)
-                assert controller.deck is None
+        mock_manager.return_value.enumerate.return_value = [mock_deck]
 
-                # Unlock
-                is_locked[0] = False
-                time.sleep(2.0)
-                assert controller.deck is not None
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-                # Lock again
-                is_locked[0] = True
-                time.sleep(1.5)
-                assert controller.deck is None
+        # Start unlocked - should connect
+        step(controller, 1)
+        assert controller.deck is mock_deck
 
-                # Cleanup
-                controller.running = False
-                controller.shutting_down = True
-                run_thread.join(timeout=2)
+        # Lock, unlock, lock again - one simulated tick per state change
+        for tick, locked in enumerate([True, False, True], start=2):
+            lockable_platform.locked = locked
+            step(controller, tick)
+            assert controller.is_locked is locked
+            assert (controller.deck is None) is locked
 
 
 class TestReconnectionErrorHandling:
     """Test error handling during reconnection"""
 
-    @pytest.fixture
-    def mock_config(self, tmp_path):
-        """Create a minimal test configuration"""
-        config_file = tmp_path / "test_config.yaml"
-        config_file.write_text(
-            """
-device:
-  brightness: 75
-
-pages:
-  main:
-    name: Main
-    buttons:
-      1:
-        text: Test
-        action:
-          type: command
-          command: echo test
-"""
-        )
-        return str(config_file)
-
-    def test_handles_intermittent_usb_errors(self, mock_config):
+    def test_handles_intermittent_usb_errors(self, mock_manager, mock_config, mock_deck, step):
         """
         Test scenario: USB enumeration occasionally fails.
         Expected: Controller retries and eventually succeeds.
         """
-        call_count = [0]
+        # Fail twice, succeed on the 3rd try
+        mock_manager.return_value.enumerate.side_effect = [
+            OSError("USB error"),
+            OSError("USB error"),
+            [mock_deck],
+        ]
 
-        def failing_enumerate():
-            call_count[0] += 1
-            if call_count[0] <= 2:
-                raise OSError("USB error")
-
-            # Success on 3rd try
-            deck = MagicMock()
-            deck.deck_type.return_value = "Stream Deck"
-            deck.key_count.return_value = 15
-            deck.key_image_format.return_value = {
-                "size": (72, 72),
-                "format": "JPEG",
-                "rotation": 0,
-                "mirror": (False, False),
-            }
-            deck.is_visual.return_value = True
-            deck.set_brightness = MagicMock()
-            deck.set_key_callback = MagicMock()
-            deck.set_key_image = MagicMock()
-            return [deck]
-
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            mock_manager.return_value.enumerate.side_effect = failing_enumerate
-
-            controller = DeckyController(mock_config)
-
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
-
-            # Wait for retries
-            time.sleep(6.0)
-
-            # Should eventually succeed
-            assert controller.deck is not None
-
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
-
-    def test_continues_running_despite_device_errors(self, mock_config):
+        controller = DeckyController(mock_config)
+        controller.load_config()
+
+        for tick in range(1, 4):
+            assert controller.deck is None
+            step(controller, tick)
+
+        # Should eventually succeed
+        assert controller.deck is mock_deck
+
+    def test_continues_running_despite_device_errors(self, mock_manager, mock_config, step):
         """
         Test scenario: Device repeatedly fails to connect.
         Expected: Controller keeps running and retrying.
         """
-        with patch("decky.device.manager.StreamDeckManager") as mock_manager:
-            # Always fail
-            mock_manager.return_value.enumerate.return_value = []
-
-            controller = DeckyController(mock_config)
-
-            run_thread = threading.Thread(target=controller.run, daemon=True)
-            run_thread.start()
+        # Always fail
+        mock_manager.return_value.enumerate.return_value = []
 
-            # Let it retry several times
-            time.sleep(5.0)
+        controller = DeckyController(mock_config)
+        controller.load_config()
 
-            # Should still be running
-            assert controller.running is True
-            assert run_thread.is_alive()
+        # Let it retry several times
+        for tick in range(1, 6):
+            step(controller, tick)
 
-            # Cleanup
-            controller.running = False
-            controller.shutting_down = True
-            run_thread.join(timeout=2)
+        # Should keep retrying once per reconnect interval
+        assert controller.deck is None
+        assert mock_manager.return_value.enumerate.call_count == 5
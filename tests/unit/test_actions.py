@@ -2,16 +2,44 @@
 Tests for action system - focusing on preventing regressions
 """
 
-from unittest.mock import Mock, call, patch
+from unittest.mock import patch
 
 import pytest
 
 from decky.actions.application import ApplicationAction
-from decky.actions.base import ActionContext, BaseAction
+from decky.actions.base import BaseAction
 from decky.actions.command import CommandAction
 from decky.actions.registry import ActionRegistry
 
 
+class _SimpleAction(BaseAction):
+    """Minimal action registered under the "test" type"""
+
+    action_type = "test"
+
+    def execute(self, context, config):
+        return True
+
+
+class _ReplacementAction(BaseAction):
+    """Second action claiming the "test" type"""
+
+    action_type = "test"
+
+    def execute(self, context, config):
+        return False
+
+
+class _LinuxOnlyAction(BaseAction):
+    """Action limited to Linux platforms"""
+
+    action_type = "linux_only"
+    supported_platforms = ["linux", "kde"]
+
+    def execute(self, context, config):
+        return True
+
+
 class TestActionRegistry:
     """Test action registry functionality"""
 
@@ -19,13 +47,7 @@ class TestActionRegistry:
         """Test registering a new action type"""
         registry = ActionRegistry()
 
-        class TestAction(BaseAction):
-            action_type = "test"
-
-            def execute(self, context, config):
-                return True
-
-        registry.register(TestAction)
+        registry.register(_SimpleAction)
         assert "test" in registry.list_actions()
         assert registry.get_action("test") is not None
 
@@ -33,20 +55,8 @@ class TestActionRegistry:
         """Test that registering duplicate action types warns"""
         registry = ActionRegistry()
 
-        class TestAction1(BaseAction):
-            action_type = "test"
-
-            def execute(self, context, config):
-                return True
-
-        class TestAction2(BaseAction):
-            action_type = "test"
-
-            def execute(self, context, config):
-                return False
-
-        registry.register(TestAction1)
-        registry.register(TestAction2)
+        registry.register(_SimpleAction)
+        registry.register(_ReplacementAction)
 
         assert "Overwriting existing action type: test" in caplog.text
 
@@ -54,14 +64,7 @@ class TestActionRegistry:
         """Test platform support checking"""
         registry = ActionRegistry()
 
-        class LinuxOnlyAction(BaseAction):
-            action_type = "linux_only"
-            supported_platforms = ["linux", "kde"]
-
-            def execute(self, context, config):
-                return True
-
-        registry.register(LinuxOnlyAction)
+        registry.register(_LinuxOnlyAction)
         assert registry.is_supported("linux_only", "kde")
         assert registry.is_supported("linux_only", "linux")
         assert not registry.is_supported("linux_only", "windows")
@@ -75,7 +78,7 @@ class TestCommandAction:
         action = CommandAction()
         config = {"command": "echo test"}
 
-        with patch("subprocess.Popen") as mock_popen:
+        with patch("decky.actions.command.subprocess.Popen") as mock_popen:
             result = action.execute(action_context, config)
             assert result is True
             mock_popen.assert_called_once_with("echo test", shell=True)
@@ -99,7 +102,9 @@ class TestCommandAction:
         action = CommandAction()
         config = {"command": "failing_command"}
 
-        with patch("subprocess.Popen", side_effect=Exception("Command failed")):
+        with patch(
+            "decky.actions.command.subprocess.Popen", side_effect=Exception("Command failed")
+        ):
             result = action.execute(action_context, config)
             assert result is False
 
@@ -123,7 +128,7 @@ class TestApplicationAction:
         action_context.platform = None
 
         with patch("os.path.exists", return_value=True):
-            with patch("subprocess.Popen") as mock_popen:
+            with patch("decky.actions.application.subprocess.Popen") as mock_popen:
                 result = action.execute(action_context, config)
                 assert result is True
                 assert mock_popen.called
@@ -135,7 +140,7 @@ class TestApplicationAction:
         action_context.platform = None
 
         with patch("os.path.exists", return_value=False):
-            with patch("subprocess.Popen") as mock_popen:
+            with patch("decky.actions.application.subprocess.Popen") as mock_popen:
                 result = action.execute(action_context, config)
                 assert result is True
                 mock_popen.assert_called_once_with("test-app", shell=True)
@@ -152,34 +157,36 @@ class TestApplicationAction:
 class TestActionCompatibility:
     """Test backward compatibility and regression prevention"""
 
-    def test_action_parameters_unchanged(self):
-        """Ensure action parameters haven't changed (prevents breaking configs)"""
-        # This test ensures we don't accidentally change required parameters
-        command_action = CommandAction()
-        assert command_action.get_required_params() == ["command"]
-
-        app_action = ApplicationAction()
-        assert app_action.get_required_params() == ["app"]
-
-    def test_action_types_unchanged(self):
-        """Ensure action type identifiers haven't changed"""
+    @pytest.mark.parametrize(
+        "action_class,action_type,required_params",
+        [
+            pytest.param(CommandAction, "command", ["command"], id="command"),
+            pytest.param(ApplicationAction, "application", ["app"], id="application"),
+        ],
+    )
+    def test_action_contract_unchanged(self, action_class, action_type, required_params):
+        """Ensure action type identifiers and parameters haven't changed"""
         # This prevents breaking existing configurations
-        assert CommandAction.action_type == "command"
-        assert ApplicationAction.action_type == "application"
+        assert action_class.action_type == action_type
+        assert action_class().get_required_params() == required_params
 
     def test_action_execution_non_blocking(self, action_context):
         """Ensure actions don't block (regression test for freezing issue)"""
-        import time
-
         action = CommandAction()
         config = {"command": "sleep 10"}
 
-        start_time = time.time()
-        with patch("subprocess.Popen") as mock_popen:
-            # Popen should return immediately
+        with patch("decky.actions.command.subprocess.Popen") as mock_popen:
             result = action.execute(action_context, config)
-            elapsed = time.time() - start_time
 
-            assert result is True
-            assert elapsed < 1.0  # Should complete almost instantly
-            mock_popen.assert_called_once()
+        assert result is True
+        mock_popen.assert_called_once_with("sleep 10", shell=True)
+
+    def test_command_action_does_not_wait_for_process(self, action_context):
+        """Ensure the launched process is never waited on"""
+        action = CommandAction()
+
+        with patch("decky.actions.command.subprocess.Popen") as mock_popen:
+            action.execute(action_context, {"command": "sleep 10"})
+
+        assert not mock_popen.return_value.wait.called
+        assert not mock_popen.return_value.communicate.called
@@ -6,21 +6,23 @@ path traversal and other security issues.
 """
 
 import pytest
+import yaml
 
 from decky.cli import DeckyCLI
 
 
+@pytest.fixture(scope="module")
+def cli():
+    """Create CLI instance for testing (shared; patch attributes with monkeypatch)"""
+    return DeckyCLI()
+
+
 class TestConfigNameValidation:
     """Test configuration name validation"""
 
-    @pytest.fixture
-    def cli(self):
-        """Create CLI instance for testing"""
-        return DeckyCLI()
-
-    def test_valid_config_names(self, cli):
-        """Test that valid config names are accepted"""
-        valid_names = [
+    @pytest.mark.parametrize(
+        "name",
+        [
             "default",
             "kde",
             "work",
@@ -28,74 +30,75 @@ class TestConfigNameValidation:
             "config_v2",
             "CONFIG123",
             "test-config-01",
-        ]
-
-        for name in valid_names:
-            # Should not raise exception
-            cli._validate_config_name(name)
+        ],
+    )
+    def test_valid_config_names(self, cli, name):
+        """Test that valid config names are accepted"""
+        # Should not raise exception
+        cli._validate_config_name(name)
 
-    def test_invalid_config_names_with_path_separators(self, cli):
-        """Test that config names with path separators are rejected"""
-        invalid_names = [
+    @pytest.mark.parametrize(
+        "name",
+        [
             "../etc/passwd",
             "my/config",
             "..\\windows",
             "config/../other",
             "/etc/config",
-        ]
-
-        for name in invalid_names:
-            with pytest.raises(ValueError, match="Invalid config name"):
-                cli._validate_config_name(name)
+        ],
+    )
+    def test_invalid_config_names_with_path_separators(self, cli, name):
+        """Test that config names with path separators are rejected"""
+        with pytest.raises(ValueError, match="Invalid config name"):
+            cli._validate_config_name(name)
 
-    def test_invalid_config_names_with_special_chars(self, cli):
-        """Test that config names with special characters are rejected"""
-        invalid_names = [
+    @pytest.mark.parametrize(
+        "name",
+        [
             "my config",  # Space
             "config@home",  # @
             "config!",  # !
             "config#1",  # #
             "config$var",  # $
             "config&more",  # &
-        ]
-
-        for name in invalid_names:
-            with pytest.raises(ValueError, match="Invalid config name"):
-                cli._validate_config_name(name)
+        ],
+    )
+    def test_invalid_config_names_with_special_chars(self, cli, name):
+        """Test that config names with special characters are rejected"""
+        with pytest.raises(ValueError, match="Invalid config name"):
+            cli._validate_config_name(name)
 
     def test_empty_config_name(self, cli):
         """Test that empty config name is rejected"""
         with pytest.raises(ValueError, match="cannot be empty"):
             cli._validate_config_name("")
 
-    def test_reserved_names(self, cli):
+    @pytest.mark.parametrize("name", ["con", "prn", "aux", "nul", "CON", "PRN"])
+    def test_reserved_names(self, cli, name):
         """Test that Windows reserved names are rejected"""
-        reserved_names = ["con", "prn", "aux", "nul", "CON", "PRN"]
-
-        for name in reserved_names:
-            with pytest.raises(ValueError, match="reserved name"):
-                cli._validate_config_name(name)
+        with pytest.raises(ValueError, match="reserved name"):
+            cli._validate_config_name(name)
 
-    def test_validation_on_edit_config(self, cli, tmp_path):
+    def test_validation_on_edit_config(self, cli, tmp_path, monkeypatch):
         """Test that edit_config validates the name"""
         # Override configs_dir for testing
-        cli.configs_dir = tmp_path
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
 
         # Invalid name should fail
         result = cli.edit_config("../etc/passwd")
         assert result == 1  # Error return code
 
-    def test_validation_on_use_config(self, cli, tmp_path):
+    def test_validation_on_use_config(self, cli, tmp_path, monkeypatch):
         """Test that use_config validates the name"""
-        cli.configs_dir = tmp_path
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
 
         # Invalid name should fail
         result = cli.use_config("config/../../secret")
         assert result == 1  # Error return code
 
-    def test_validation_on_validate_config(self, cli, tmp_path):
+    def test_validation_on_validate_config(self, cli, tmp_path, monkeypatch):
         """Test that validate_config validates the name"""
-        cli.configs_dir = tmp_path
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
 
         # Invalid name should fail
         result = cli.validate_config("bad@config")
@@ -110,7 +113,7 @@ class TestConfigPathsNotValidated:
     not for full paths supplied to 'decky run <path>'.
     """
 
-    def test_run_command_accepts_any_path(self):
+    def test_run_command_accepts_any_path(self, cli):
         """
         Test that 'decky run' accepts full paths without validation.
 
@@ -119,8 +122,6 @@ class TestConfigPathsNotValidated:
         - /home/user/.decky/configs/custom.yaml
         - /tmp/test-config.yaml
         """
-        cli = DeckyCLI()
-
         # The run_daemon method should NOT call _validate_config_name
         # It passes the path directly to ConfigLoader which has its own validation
         # This test just documents the expected behavior
@@ -140,3 +141,45 @@ class TestConfigPathsNotValidated:
             # Just verify the method signature accepts any string
             # Actual validation happens in ConfigLoader, not CLI
             assert isinstance(path, str)
+
+
+class TestValidateConfigPageReferences:
+    """Test page references are resolved against every defined page"""
+
+    def _write(self, tmp_path, pages):
+        (tmp_path / "pages.yaml").write_text(yaml.safe_dump({"styles": {}, "pages": pages}))
+
+    def test_forward_page_reference_is_not_warned(self, cli, tmp_path, capsys, monkeypatch):
+        """A button may switch to a page defined later in the file"""
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
+        self._write(
+            tmp_path,
+            {
+                "main": {"buttons": {1: {"action": {"type": "page", "page": "later"}}}},
+                "later": {"buttons": {1: {"action": {"type": "page", "page": "main"}}}},
+            },
+        )
+
+        assert cli.validate_config("pages") == 0
+        assert "unknown page" not in capsys.readouterr().out
+
+    def test_unknown_page_reference_is_warned(self, cli, tmp_path, capsys, monkeypatch):
+        """A button switching to a missing page produces a warning"""
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
+        self._write(
+            tmp_path,
+            {"main": {"buttons": {1: {"action": {"type": "page", "page": "missing"}}}}},
+        )
+
+        assert cli.validate_config("pages") == 0
+        assert "unknown page 'missing'" in capsys.readouterr().out
+
+    def test_page_action_without_target_is_warned(self, cli, tmp_path, capsys, monkeypatch):
+        """A page action missing its 'page' key reports the missing key"""
+        monkeypatch.setattr(cli, "configs_dir", tmp_path)
+        self._write(tmp_path, {"main": {"buttons": {1: {"action": {"type": "page"}}}}})
+
+        assert cli.validate_config("pages") == 0
+        output = capsys.readouterr().out
+        assert "has page action without 'page' target" in output
+        assert "unknown page" not in output
@@ -5,34 +5,82 @@ Tests the controller's handling of device connection, disconnection,
 and reconnection scenarios with the manager-based architecture.
 """
 
+import threading
 import time
-from unittest.mock import MagicMock, Mock, call, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
+import decky.controller as controller_module
 from decky.controller import DeckyController
 
+# Platform returned by detection for the shared controller
+PLATFORM = Mock(name="platform")
+
+# Configs assigned by reference; no test mutates them
+CONNECTION_CONFIG = {
+    "device": {"brightness": 75},
+    "styles": {},
+    "pages": {"main": {"buttons": {}}},
+}
+RECONNECTION_CONFIG = {
+    "device": {"brightness": 100},
+    "styles": {},
+    "pages": {"main": {"buttons": {}}},
+}
+
+# Stand-in deck for tests that only hand it to mocked managers and check identity
+PASSIVE_DECK = SimpleNamespace(deck_type=lambda: "Stream Deck", key_count=lambda: 15)
+
+
+@pytest.fixture(scope="module")
+def shared_controller():
+    """Build one controller with mocked dependencies for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        # Component classes become MagicMock so each constructor call yields a mock
+        for name in ("ConfigLoader", "DeviceManager", "ButtonRenderer"):
+            mp.setattr(controller_module, name, MagicMock)
+        mp.setattr(controller_module, "registry", MagicMock())
+        mp.setattr(controller_module, "detect_platform", lambda: PLATFORM)
+        return DeckyController("/test/config.yaml")
+
+
+def _reset_controller(controller):
+    """Clear mock calls and connection state left behind by a previous test."""
+    for component in (
+        controller.config_loader,
+        controller.device_manager,
+        controller.button_renderer,
+    ):
+        component.reset_mock(return_value=True, side_effect=True)
+    PLATFORM.reset_mock(return_value=True, side_effect=True)
+    controller.platform = PLATFORM
+
+    connection_manager = controller.connection_manager
+    connection_manager.deck = None
+    connection_manager.platform = PLATFORM
+    connection_manager.running = False
+    connection_manager.shutting_down = False
+    connection_manager.is_locked = False
+    connection_manager._last_reconnect_attempt = 0.0
+    connection_manager._last_connection_check = 0.0
+
+    controller.animated_buttons.clear()
+    controller.page_manager.current_page = "main"
+    controller.running = False
+    return controller
+
 
 class TestControllerConnection:
     """Test suite for controller connection management."""
 
     @pytest.fixture
-    def controller(self):
-        """Create a controller instance with mocked dependencies."""
-        with (
-            patch("decky.controller.ConfigLoader"),
-            patch("decky.controller.DeviceManager"),
-            patch("decky.controller.ButtonRenderer"),
-            patch("decky.controller.registry"),
-            patch("decky.controller.detect_platform"),
-        ):
-            controller = DeckyController("/test/config.yaml")
-            controller.config = {
-                "device": {"brightness": 75},
-                "styles": {},
-                "pages": {"main": {"buttons": {}}},
-            }
-            return controller
+    def controller(self, shared_controller):
+        """Reset the shared controller for a connection test."""
+        controller = _reset_controller(shared_controller)
+        controller.config = CONNECTION_CONFIG
+        return controller
 
     def test_connect_successful(self, controller):
         """Test successful connection to Stream Deck."""
@@ -50,23 +98,17 @@ class TestControllerConnection:
         assert controller.deck == mock_deck
         controller.device_manager.connect.assert_called_once()
 
-    def test_connect_no_device(self, controller):
-        """Test connection when no device is available."""
-        # Setup mocks
-        controller.device_manager.connect.return_value = None
-
-        # Test connection
-        result = controller.connect()
-
-        # Verify behavior
-        assert result is False
-        assert controller.deck is None
-        controller.device_manager.connect.assert_called_once()
-
-    def test_connect_handles_exception(self, controller):
-        """Test that connection exceptions are handled gracefully."""
-        # Setup mocks
-        controller.device_manager.connect.side_effect = Exception("Connection failed")
+    @pytest.mark.parametrize(
+        "connect_behavior",
+        [
+            pytest.param({"return_value": None}, id="no_device"),
+            pytest.param({"side_effect": Exception("Connection failed")}, id="exception"),
+            pytest.param({"side_effect": ValueError("Unexpected error")}, id="unexpected_error"),
+        ],
+    )
+    def test_connect_failure(self, controller, connect_behavior):
+        """Test that a missing device or connection error leaves the deck unset."""
+        controller.device_manager.connect.configure_mock(**connect_behavior)
 
         # Test connection
         result = controller.connect()
@@ -74,6 +116,7 @@ class TestControllerConnection:
         # Verify error handling
         assert result is False
         assert controller.deck is None
+        controller.device_manager.connect.assert_called_once()
 
     def test_setup_deck_configures_device(self, controller):
         """Test that device setup callback properly configures the device."""
@@ -110,66 +153,43 @@ class TestControllerConnection:
         # Should not crash even if setup fails
         controller._on_device_connected(mock_deck)
 
-    def test_disconnect_deck_clean(self, controller):
-        """Test clean disconnection from Stream Deck."""
-        # Setup mocks
-        mock_deck = Mock()
-        controller.connection_manager.deck = mock_deck
-        controller.device_manager.disconnect.return_value = True
+    @pytest.mark.parametrize(
+        "deck,clean_disconnect",
+        [
+            pytest.param(PASSIVE_DECK, True, id="clean"),
+            # Device was already unplugged; the reference must still be cleared
+            pytest.param(PASSIVE_DECK, False, id="already_unplugged"),
+            pytest.param(None, None, id="no_deck"),
+        ],
+    )
+    def test_disconnect_deck(self, controller, deck, clean_disconnect):
+        """Test that disconnect always clears the deck and only releases a real one."""
+        controller.connection_manager.deck = deck
+        controller.device_manager.disconnect.return_value = clean_disconnect
 
         # Test disconnection through connection manager
         controller.connection_manager.disconnect()
 
         # Verify behavior
         assert controller.deck is None
-        controller.device_manager.disconnect.assert_called_once_with(mock_deck)
-
-    def test_disconnect_deck_with_errors(self, controller):
-        """Test disconnection when device is already unplugged."""
-        # Setup mocks
-        mock_deck = Mock()
-        controller.connection_manager.deck = mock_deck
-        controller.device_manager.disconnect.return_value = False
-
-        # Test disconnection
-        controller.connection_manager.disconnect()
-
-        # Should still clear deck reference
-        assert controller.deck is None
-        controller.device_manager.disconnect.assert_called_once_with(mock_deck)
-
-    def test_disconnect_deck_already_none(self, controller):
-        """Test that disconnect handles None deck gracefully."""
-        controller.connection_manager.deck = None
-
-        # Should not crash
-        controller.connection_manager.disconnect()
-        controller.device_manager.disconnect.assert_not_called()
+        if deck is None:
+            controller.device_manager.disconnect.assert_not_called()
+        else:
+            controller.device_manager.disconnect.assert_called_once_with(deck)
 
 
 class TestControllerReconnection:
     """Test suite for controller reconnection logic."""
 
     @pytest.fixture
-    def controller(self):
-        """Create a controller with mocked components for testing."""
-        with (
-            patch("decky.controller.ConfigLoader"),
-            patch("decky.controller.DeviceManager"),
-            patch("decky.controller.ButtonRenderer"),
-            patch("decky.controller.registry"),
-            patch("decky.controller.detect_platform"),
-        ):
-            controller = DeckyController("/test/config.yaml")
-            controller.config = {
-                "device": {"brightness": 100},
-                "styles": {},
-                "pages": {"main": {"buttons": {}}},
-            }
-            controller.config_loader.load.return_value = controller.config
-            # Mock the screen lock monitoring to prevent thread issues
-            controller.platform = None  # Disable screen lock monitoring
-            return controller
+    def controller(self, shared_controller):
+        """Reset the shared controller for a reconnection test."""
+        controller = _reset_controller(shared_controller)
+        controller.config = RECONNECTION_CONFIG
+        controller.config_loader.load.return_value = controller.config
+        # Mock the screen lock monitoring to prevent thread issues
+        controller.platform = None  # Disable screen lock monitoring
+        return controller
 
     def test_reconnection_logic(self, controller):
         """Test that reconnection logic works correctly without running the full loop."""
@@ -197,7 +217,7 @@ class TestControllerReconnection:
     def test_disconnection_detection(self, controller):
         """Test that disconnection is detected through ConnectionManager."""
         # Setup initial connection
-        mock_deck = Mock()
+        mock_deck = PASSIVE_DECK
         controller.connection_manager.deck = mock_deck
         controller.device_manager.is_connected.return_value = False
 
@@ -209,7 +229,7 @@ class TestControllerReconnection:
 
     def test_connection_state_handling(self, controller):
         """Test proper handling of connection state changes."""
-        mock_deck = Mock()
+        mock_deck = PASSIVE_DECK
 
         # Test that is_connected is checked properly
         controller.connection_manager.deck = mock_deck
@@ -247,6 +267,31 @@ class TestControllerReconnection:
         controller.connection_manager.is_locked = False
         # Connection logic is tested in integration tests
 
+    def test_state_change_notifies_waiters(self, controller):
+        """Test that connect, disconnect and lock changes wake condition waiters."""
+        mock_deck = Mock()
+        mock_deck.deck_type.return_value = "Stream Deck"
+        mock_deck.key_count.return_value = 15
+        controller.device_manager.connect.return_value = mock_deck
+        state_cv = controller.connection_manager._state_cv
+
+        def wait_after(action, predicate):
+            timer = threading.Timer(0.01, action)
+            start = time.monotonic()
+            with state_cv:
+                timer.start()
+                assert state_cv.wait_for(predicate, timeout=5)
+            timer.join()
+            # wait_for re-checks the predicate on timeout, so also bound the wait
+            assert time.monotonic() - start < 1
+
+        wait_after(controller.connect, lambda: controller.deck is mock_deck)
+        wait_after(controller.connection_manager.disconnect, lambda: controller.deck is None)
+
+        controller.connection_manager.platform = Mock()
+        controller.connection_manager.platform.is_screen_locked.return_value = True
+        wait_after(controller.connection_manager._check_screen_lock, lambda: controller.is_locked)
+
     def test_graceful_shutdown(self, controller):
         """Test graceful shutdown flag behavior."""
         # Test shutting_down property accessor
@@ -258,15 +303,3 @@ class TestControllerReconnection:
         # Verify it's set in connection manager
         assert controller.connection_manager.shutting_down is True
         assert controller.shutting_down is True
-
-    def test_unexpected_error_handling(self, controller):
-        """Test that connection errors are handled gracefully."""
-        # Setup - connection raises unexpected error
-        controller.device_manager.connect.side_effect = ValueError("Unexpected error")
-
-        # Should handle error gracefully
-        result = controller.connect()
-
-        # Verify error handling
-        assert result is False
-        assert controller.deck is None
@@ -5,20 +5,55 @@ These tests verify the robustness of USB device connection, disconnection,
 and reconnection handling.
 """
 
-from unittest.mock import MagicMock, Mock, PropertyMock, patch
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock, patch
 
-import pytest
+from StreamDeck.Transport.Transport import TransportError
 
 from decky.device.manager import DeviceManager
 
 
+@dataclass(slots=True)
+class FakeDeck:
+    """Stream Deck stand-in that counts lifecycle calls and raises configured errors"""
+
+    reset_error: Optional[Exception] = None
+    close_error: Optional[Exception] = None
+    connected_error: Optional[Exception] = None
+    plugged: bool = True
+    reset_count: int = 0
+    close_count: int = 0
+    connected_count: int = 0
+
+    def reset(self):
+        """Count the reset and raise the configured error, if any"""
+        self.reset_count += 1
+        if self.reset_error:
+            raise self.reset_error
+
+    def close(self):
+        """Count the close and raise the configured error, if any"""
+        self.close_count += 1
+        if self.close_error:
+            raise self.close_error
+
+    def connected(self):
+        """Count the check and report whether the deck is still plugged in"""
+        self.connected_count += 1
+        if self.connected_error:
+            raise self.connected_error
+        return self.plugged
+
+
 class TestDeviceManager:
     """Test suite for DeviceManager class."""
 
-    def test_init_creates_stream_deck_manager(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_init_creates_stream_deck_manager(self, mock_sdm_class):
         """Test that initialization creates the internal StreamDeckManager."""
         manager = DeviceManager()
-        assert hasattr(manager, "_stream_deck_manager")
+        assert manager._stream_deck_manager is mock_sdm_class.return_value
 
     @patch("decky.device.manager.StreamDeckManager")
     def test_connect_success(self, mock_sdm_class):
@@ -59,7 +94,8 @@ class TestDeviceManager:
         mock_sdm.enumerate.assert_called_once()
 
     @patch("decky.device.manager.StreamDeckManager")
-    def test_connect_handles_usb_error(self, mock_sdm_class):
+    @patch("decky.device.manager.time.sleep")
+    def test_connect_handles_usb_error(self, mock_sleep, mock_sdm_class):
         """Test that USB errors during connection are handled gracefully."""
         # Setup mocks
         mock_deck = Mock()
@@ -74,8 +110,55 @@ class TestDeviceManager:
         result = manager.connect()
 
         # Verify error handling
+        assert result is None
+        assert mock_deck.open.call_count == len(DeviceManager.OPEN_RETRY_DELAYS) + 1
+        mock_deck.reset.assert_not_called()
+
+    @patch("decky.device.manager.StreamDeckManager")
+    @patch("decky.device.manager.time.sleep")
+    def test_connect_closes_on_open_failure(self, mock_sleep, mock_sdm_class):
+        """Test that a device that fails to open is closed to release its handle."""
+        mock_deck = Mock()
+        mock_deck.open.side_effect = TransportError("Could not open HID device.")
+        mock_sdm_class.return_value.enumerate.return_value = [mock_deck]
+
+        result = DeviceManager().connect()
+
+        assert result is None
+        mock_deck.close.assert_called_once()
+
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_connect_closes_on_reset_failure(self, mock_sdm_class):
+        """Test that a device is closed when reset fails after opening."""
+        mock_deck = Mock()
+        mock_deck.reset.side_effect = OSError("Reset failed")
+        mock_deck.close.side_effect = OSError("Already gone")
+        mock_sdm_class.return_value.enumerate.return_value = [mock_deck]
+
+        result = DeviceManager().connect()
+
         assert result is None
         mock_deck.open.assert_called_once()
+        mock_deck.close.assert_called_once()
+
+    @patch("decky.device.manager.StreamDeckManager")
+    @patch("decky.device.manager.time.sleep")
+    def test_connect_retries_transient_open_error(self, mock_sleep, mock_sdm_class):
+        """Test that a briefly unavailable device is opened on a later attempt."""
+        mock_deck = Mock()
+        mock_deck.open.side_effect = [
+            TransportError("Could not open HID device."),
+            TransportError("Could not open HID device."),
+            None,
+        ]
+        mock_sdm_class.return_value.enumerate.return_value = [mock_deck]
+
+        manager = DeviceManager()
+        result = manager.connect()
+
+        assert result == mock_deck
+        assert mock_deck.open.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.05, 0.1]
 
     @patch("decky.device.manager.StreamDeckManager")
     def test_connect_reenumerates_each_time(self, mock_sdm_class):
@@ -108,22 +191,26 @@ class TestDeviceManager:
 
         # Verify enumerate was called each time
         assert mock_sdm.enumerate.call_count == 3
+        # The HID backend manager is built once, not per connect
+        mock_sdm_class.assert_called_once_with()
 
-    def test_disconnect_with_valid_deck(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_disconnect_with_valid_deck(self, mock_sdm_class):
         """Test clean disconnection from a valid device."""
-        # Setup mock deck
-        mock_deck = Mock()
+        # Setup fake deck
+        deck = FakeDeck()
 
         # Test disconnection
         manager = DeviceManager()
-        result = manager.disconnect(mock_deck)
+        result = manager.disconnect(deck)
 
         # Verify behavior
         assert result is True
-        mock_deck.reset.assert_called_once()
-        mock_deck.close.assert_called_once()
+        assert deck.reset_count == 1
+        assert deck.close_count == 1
 
-    def test_disconnect_with_none(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_disconnect_with_none(self, mock_sdm_class):
         """Test that disconnect handles None gracefully."""
         manager = DeviceManager()
         result = manager.disconnect(None)
@@ -131,53 +218,54 @@ class TestDeviceManager:
         # Should return True and not crash
         assert result is True
 
-    def test_disconnect_with_already_disconnected_device(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_disconnect_with_already_disconnected_device(self, mock_sdm_class):
         """Test disconnection when device is already unplugged."""
-        # Setup mock deck that throws errors (device unplugged)
-        mock_deck = Mock()
-        mock_deck.reset.side_effect = Exception("No HID device")
-        mock_deck.close.side_effect = Exception("No HID device")
+        # Setup fake deck that throws errors (device unplugged)
+        deck = FakeDeck(
+            reset_error=Exception("No HID device"), close_error=Exception("No HID device")
+        )
 
         # Test disconnection
         manager = DeviceManager()
-        result = manager.disconnect(mock_deck)
+        result = manager.disconnect(deck)
 
         # Should handle errors gracefully
         assert result is False
-        mock_deck.reset.assert_called_once()
-        mock_deck.close.assert_called_once()
+        assert deck.reset_count == 1
+        assert deck.close_count == 1
 
-    def test_disconnect_partial_failure(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_disconnect_partial_failure(self, mock_sdm_class):
         """Test disconnection when only reset fails but close works."""
-        # Setup mock deck
-        mock_deck = Mock()
-        mock_deck.reset.side_effect = Exception("Reset failed")
-        # close() succeeds
+        # Setup fake deck; close() succeeds
+        deck = FakeDeck(reset_error=Exception("Reset failed"))
 
         # Test disconnection
         manager = DeviceManager()
-        result = manager.disconnect(mock_deck)
+        result = manager.disconnect(deck)
 
         # Should return False but still attempt close
         assert result is False
-        mock_deck.reset.assert_called_once()
-        mock_deck.close.assert_called_once()
+        assert deck.reset_count == 1
+        assert deck.close_count == 1
 
-    def test_is_connected_with_valid_deck(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_is_connected_with_valid_deck(self, mock_sdm_class):
         """Test connection check with a connected device."""
-        # Setup mock deck
-        mock_deck = Mock()
-        mock_deck.is_visual.return_value = True
+        # Setup fake deck
+        deck = FakeDeck()
 
         # Test connection check
         manager = DeviceManager()
-        result = manager.is_connected(mock_deck)
+        result = manager.is_connected(deck)
 
         # Should detect as connected
         assert result is True
-        mock_deck.is_visual.assert_called_once()
+        assert deck.connected_count == 1
 
-    def test_is_connected_with_none(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_is_connected_with_none(self, mock_sdm_class):
         """Test that is_connected handles None gracefully."""
         manager = DeviceManager()
         result = manager.is_connected(None)
@@ -185,47 +273,47 @@ class TestDeviceManager:
         # Should return False for None
         assert result is False
 
-    def test_is_connected_detects_unplugged(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_is_connected_detects_unplugged(self, mock_sdm_class):
         """Test that is_connected detects when device is unplugged."""
-        # Setup mock deck that throws USB error
-        mock_deck = Mock()
-        mock_deck.is_visual.side_effect = OSError("USB device not found")
+        # Setup fake deck that is no longer attached to the host
+        deck = FakeDeck(plugged=False)
 
         # Test connection check
         manager = DeviceManager()
-        result = manager.is_connected(mock_deck)
+        result = manager.is_connected(deck)
 
         # Should detect as disconnected
         assert result is False
-        mock_deck.is_visual.assert_called_once()
+        assert deck.connected_count == 1
 
-    def test_is_connected_handles_io_errors(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_is_connected_handles_io_errors(self, mock_sdm_class):
         """Test that is_connected handles IOError (another USB disconnect indicator)."""
-        # Setup mock deck that throws IOError
-        mock_deck = Mock()
-        mock_deck.is_visual.side_effect = IOError("Device not responding")
+        # Setup fake deck that throws IOError
+        deck = FakeDeck(connected_error=IOError("Device not responding"))
 
         # Test connection check
         manager = DeviceManager()
-        result = manager.is_connected(mock_deck)
+        result = manager.is_connected(deck)
 
         # Should detect as disconnected
         assert result is False
-        mock_deck.is_visual.assert_called_once()
+        assert deck.connected_count == 1
 
-    def test_is_connected_handles_unexpected_errors(self):
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_is_connected_handles_unexpected_errors(self, mock_sdm_class):
         """Test that is_connected handles unexpected errors gracefully."""
-        # Setup mock deck that throws unexpected error
-        mock_deck = Mock()
-        mock_deck.is_visual.side_effect = ValueError("Unexpected error")
+        # Setup fake deck that throws unexpected error
+        deck = FakeDeck(connected_error=ValueError("Unexpected error"))
 
         # Test connection check
         manager = DeviceManager()
-        result = manager.is_connected(mock_deck)
+        result = manager.is_connected(deck)
 
         # Should detect as disconnected for any error
         assert result is False
-        mock_deck.is_visual.assert_called_once()
+        assert deck.connected_count == 1
 
 
 class TestDeviceManagerIntegration:
@@ -238,7 +326,7 @@ class TestDeviceManagerIntegration:
         mock_deck = Mock()
         mock_deck.deck_type.return_value = "Stream Deck Original"
         mock_deck.key_count.return_value = 15
-        mock_deck.is_visual.return_value = True
+        mock_deck.connected.return_value = True
 
         mock_sdm = Mock()
         mock_sdm.enumerate.return_value = [mock_deck]
@@ -281,14 +369,14 @@ class TestDeviceManagerIntegration:
 
         # Initial connection
         mock_sdm.enumerate.return_value = [mock_deck1]
-        mock_deck1.is_visual.return_value = True
+        mock_deck1.connected.return_value = True
 
         deck1 = manager.connect()
         assert deck1 == mock_deck1
         assert manager.is_connected(deck1) is True
 
-        # Device gets unplugged (is_connected starts failing)
-        mock_deck1.is_visual.side_effect = OSError("Device not found")
+        # Device gets unplugged (no longer enumerated by HID)
+        mock_deck1.connected.return_value = False
         assert manager.is_connected(deck1) is False
 
         # Try to disconnect the unplugged device (should handle errors)
@@ -304,7 +392,7 @@ class TestDeviceManagerIntegration:
         assert deck2 != deck1  # Different device instance after replug
 
         # New device should work normally
-        mock_deck2.is_visual.return_value = True
+        mock_deck2.connected.return_value = True
         assert manager.is_connected(deck2) is True
 
     @patch("decky.device.manager.StreamDeckManager")
@@ -324,3 +412,4 @@ class TestDeviceManagerIntegration:
 
         # Should enumerate each time (for hot-plug detection)
         assert mock_sdm.enumerate.call_count == 3
+        mock_sdm_class.assert_called_once_with()
@@ -2,13 +2,25 @@
 Tests for animated GIF support using AnimationManager.
 """
 
+import os
 import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from PIL import Image
 
-from decky.managers.animation import AnimationManager
+from decky.managers.animation import AnimationManager, _decode_gif
+from decky.managers.page import PageManager
+
+
+def _seek_until(n_frames):
+    """Seek side effect that ends a mocked GIF after ``n_frames`` frames."""
+
+    def seek(frame_num):
+        if frame_num >= n_frames:
+            raise EOFError
+
+    return seek
 
 
 class TestGIFAnimation:
@@ -16,12 +28,21 @@ class TestGIFAnimation:
 
     @pytest.fixture
     def animation_manager(self):
-        """Create an AnimationManager with mocked renderer."""
+        """Create an AnimationManager with mocked renderer and an empty decode cache."""
         mock_renderer = Mock()
         mock_renderer.render_button_with_icon.return_value = b"rendered_frame"
-        return AnimationManager(mock_renderer)
+        _decode_gif.cache_clear()
+        yield AnimationManager(mock_renderer)
+        _decode_gif.cache_clear()
 
-    def test_setup_animated_button_loads_frames(self, animation_manager):
+    @pytest.fixture
+    def gif_file(self, tmp_path):
+        """Placeholder GIF path on disk; decoding itself is patched per test."""
+        path = tmp_path / "test.gif"
+        path.touch()
+        return str(path)
+
+    def test_setup_animated_button_loads_frames(self, animation_manager, gif_file):
         """Test that animated GIF frames are loaded correctly."""
         # Create a mock animated GIF
         mock_gif = Mock(spec=Image.Image)
@@ -35,44 +56,92 @@ class TestGIFAnimation:
             frame.copy.return_value = frame
             frames.append(frame)
 
-        mock_gif.seek = Mock()
+        mock_gif.seek.side_effect = _seek_until(3)
         mock_gif.copy.side_effect = frames
 
         with patch("PIL.Image.open", return_value=mock_gif):
-            result = animation_manager.setup_animated_button(0, {"icon": "test.gif"}, "test.gif")
+            result = animation_manager.setup_animated_button(0, {"icon": "test.gif"}, gif_file)
 
         # Verify frames were loaded
         assert result is True
         assert 0 in animation_manager.animated_buttons
         anim_data = animation_manager.animated_buttons[0]
         assert len(anim_data["frames"]) == 3
-        assert len(anim_data["durations"]) == 3
+        assert list(anim_data["durations_ns"]) == [100_000_000] * 3
         assert anim_data["current_frame"] == 0
-        assert "last_update" in anim_data
+        assert "last_update_ns" in anim_data
         assert anim_data["config"] == {"icon": "test.gif"}
+        assert anim_data["rendered"] == [None, None, None]
 
-    def test_setup_animated_button_handles_static_gif(self, animation_manager):
+    def test_setup_animated_button_handles_static_gif(self, animation_manager, gif_file):
         """Test handling of non-animated GIF files."""
         mock_gif = Mock(spec=Image.Image)
         mock_gif.is_animated = False
 
         with patch("PIL.Image.open", return_value=mock_gif):
-            result = animation_manager.setup_animated_button(
-                0, {"icon": "static.gif"}, "static.gif"
-            )
+            result = animation_manager.setup_animated_button(0, {"icon": "static.gif"}, gif_file)
 
         # Should return False for non-animated GIF
         assert result is False
         assert 0 not in animation_manager.animated_buttons
 
+    def test_setup_animated_button_reuses_decoded_frames(self, animation_manager, gif_file):
+        """Test that the same unchanged GIF is decoded once across buttons."""
+        mock_gif = Mock(spec=Image.Image)
+        mock_gif.is_animated = True
+        mock_gif.n_frames = 2
+        mock_gif.info = {"duration": 100}
+        mock_gif.seek.side_effect = _seek_until(2)
+
+        with patch("PIL.Image.open", return_value=mock_gif) as mock_open:
+            assert animation_manager.setup_animated_button(0, {"icon": "a.gif"}, gif_file)
+            assert animation_manager.setup_animated_button(1, {"icon": "a.gif"}, gif_file)
+
+        mock_open.assert_called_once_with(gif_file)
+        assert (
+            animation_manager.animated_buttons[0]["frames"]
+            == animation_manager.animated_buttons[1]["frames"]
+        )
+
+    def test_setup_animated_button_redecodes_modified_gif(self, animation_manager, gif_file):
+        """Test that a GIF is decoded again after the file changes."""
+        mock_gif = Mock(spec=Image.Image)
+        mock_gif.is_animated = True
+        mock_gif.n_frames = 2
+        mock_gif.info = {"duration": 100}
+        mock_gif.seek.side_effect = _seek_until(2)
+
+        with patch("PIL.Image.open", return_value=mock_gif) as mock_open:
+            animation_manager.setup_animated_button(0, {"icon": "a.gif"}, gif_file)
+            mtime_ns = os.stat(gif_file).st_mtime_ns
+            os.utime(gif_file, ns=(mtime_ns, mtime_ns + 1_000_000_000))
+            animation_manager.setup_animated_button(0, {"icon": "a.gif"}, gif_file)
+
+        assert mock_open.call_count == 2
+
+    def test_setup_animated_button_prefits_frames_to_key_size(self, animation_manager, tmp_path):
+        """Test that frames are scaled and cropped to the deck key size once at setup."""
+        gif_path = tmp_path / "wide.gif"
+        frames = [Image.new("RGB", (40, 20), color) for color in ("red", "blue")]
+        frames[0].save(gif_path, save_all=True, append_images=frames[1:], duration=100)
+
+        result = animation_manager.setup_animated_button(
+            0, {"icon": "wide.gif"}, str(gif_path), (10, 10)
+        )
+
+        assert result is True
+        for frame in animation_manager.animated_buttons[0]["frames"]:
+            assert frame.size == (10, 10)
+            assert frame.mode == "RGBA"
+
     def test_update_animations_advances_frames(self, animation_manager):
         """Test that animations advance frames based on duration."""
         # Set up animated button
         animation_manager.animated_buttons[0] = {
             "frames": [Mock(), Mock(), Mock()],
-            "durations": [100, 100, 100],  # 100ms per frame
+            "durations_ns": [100_000_000] * 3,  # 100ms per frame
             "current_frame": 0,
-            "last_update": time.time() - 0.15,  # 150ms ago
+            "last_update_ns": time.monotonic_ns() - 150_000_000,  # 150ms ago
             "config": {"icon": "test.gif"},
         }
 
@@ -87,9 +156,9 @@ class TestGIFAnimation:
         # Set up animated button at last frame
         animation_manager.animated_buttons[0] = {
             "frames": [Mock(), Mock(), Mock()],
-            "durations": [100, 100, 100],
+            "durations_ns": [100_000_000] * 3,
             "current_frame": 2,  # Last frame
-            "last_update": time.time() - 0.15,
+            "last_update_ns": time.monotonic_ns() - 150_000_000,
             "config": {"icon": "test.gif"},
         }
 
@@ -98,21 +167,55 @@ class TestGIFAnimation:
         # Should loop back to frame 0
         assert animation_manager.animated_buttons[0]["current_frame"] == 0
 
+    def test_update_animations_advances_only_due_buttons(self, animation_manager):
+        """Test that only buttons whose frame deadline passed are advanced."""
+        started = time.monotonic_ns() - 150_000_000  # 150ms ago
+        for key in range(100):
+            # Even keys are due (100ms frames), odd keys are not (10s frames)
+            duration_ns = 100_000_000 if key % 2 == 0 else 10_000_000_000
+            animation_manager.animated_buttons[key] = {
+                "frames": [Mock(), Mock()],
+                "durations_ns": [duration_ns, duration_ns],
+                "current_frame": 0,
+                "last_update_ns": started,
+                "config": {"icon": "test.gif"},
+            }
+
+        animation_manager.update_animations(Mock())
+
+        for key, anim_data in animation_manager.animated_buttons.items():
+            assert anim_data["current_frame"] == (1 if key % 2 == 0 else 0)
+        assert len(animation_manager._deadlines) == 100
+
+    def test_update_animations_handles_zero_duration_frames(self, animation_manager):
+        """Test that zero-length frames advance once per tick instead of looping."""
+        animation_manager.animated_buttons[0] = {
+            "frames": [Mock(), Mock(), Mock()],
+            "durations_ns": [0, 0, 0],
+            "current_frame": 0,
+            "last_update_ns": time.monotonic_ns(),
+            "config": {"icon": "test.gif"},
+        }
+
+        animation_manager.update_animations(Mock())
+
+        assert animation_manager.animated_buttons[0]["current_frame"] == 1
+
     def test_update_page_synchronizes_animations(self, animation_manager):
         """Test that all animations are synchronized when switching pages."""
         # Set up some animated buttons with different frames
         animation_manager.animated_buttons[0] = {
             "frames": [Mock()],
-            "durations": [100],
+            "durations_ns": [100_000_000],
             "current_frame": 5,  # Non-zero frame
-            "last_update": 0,
+            "last_update_ns": 0,
             "config": {"icon": "test1.gif"},
         }
         animation_manager.animated_buttons[1] = {
             "frames": [Mock()],
-            "durations": [100],
+            "durations_ns": [100_000_000],
             "current_frame": 3,  # Different frame
-            "last_update": 0,
+            "last_update_ns": 0,
             "config": {"icon": "test2.gif"},
         }
 
@@ -120,11 +223,11 @@ class TestGIFAnimation:
         animation_manager.synchronize_animations()
 
         # All animated buttons should be synchronized to start at frame 0
-        current_time = time.time()
+        current_time = time.monotonic_ns()
         for key, anim_data in animation_manager.animated_buttons.items():
             assert anim_data["current_frame"] == 0
-            # last_update should be close to current time
-            assert abs(anim_data["last_update"] - current_time) < 1.0
+            # last_update_ns should be close to current time
+            assert abs(anim_data["last_update_ns"] - current_time) < 1_000_000_000
 
     def test_update_page_clears_previous_animations(self, animation_manager):
         """Test that previous page animations are cleared."""
@@ -140,38 +243,37 @@ class TestGIFAnimation:
         # Should be cleared
         assert len(animation_manager.animated_buttons) == 0
 
-    def test_find_icon_with_absolute_path(self, animation_manager):
+    def test_find_icon_with_absolute_path(self, animation_manager, gif_file):
         """Test finding icons with absolute paths (tested via PageManager)."""
         # Icon finding is in PageManager now
         # This test is covered by integration tests
         # Just verify AnimationManager can handle absolute paths
-        mock_gif = Mock()
+        mock_gif = Mock(spec=Image.Image)
         mock_gif.is_animated = True
         mock_gif.n_frames = 1
         mock_gif.info = {"duration": 100}
+        mock_gif.seek.side_effect = _seek_until(1)
         mock_gif.copy.return_value = Mock()
 
         with patch("PIL.Image.open", return_value=mock_gif):
-            result = animation_manager.setup_animated_button(
-                0, {"icon": "/absolute/path/icon.gif"}, "/absolute/path/icon.gif"
-            )
+            result = animation_manager.setup_animated_button(0, {"icon": gif_file}, gif_file)
 
         assert result is True
 
-    def test_find_icon_with_relative_path(self, animation_manager):
+    def test_find_icon_with_relative_path(self, animation_manager, gif_file, monkeypatch):
         """Test animated button setup with relative paths."""
         # Icon finding is in PageManager now
         # This test verifies AnimationManager works with any path
-        mock_gif = Mock()
+        monkeypatch.chdir(os.path.dirname(gif_file))
+        mock_gif = Mock(spec=Image.Image)
         mock_gif.is_animated = True
         mock_gif.n_frames = 1
         mock_gif.info = {"duration": 100}
+        mock_gif.seek.side_effect = _seek_until(1)
         mock_gif.copy.return_value = Mock()
 
         with patch("PIL.Image.open", return_value=mock_gif):
-            result = animation_manager.setup_animated_button(
-                0, {"icon": "icons/test.gif"}, "/home/user/.decky/icons/test.gif"
-            )
+            result = animation_manager.setup_animated_button(0, {"icon": "test.gif"}, "test.gif")
 
         assert result is True
 
@@ -195,3 +297,78 @@ class TestGIFAnimation:
         # Check that the correct frame was passed (mock_frame2 at index 1)
         call_args = animation_manager.button_renderer.render_button_with_icon.call_args
         assert call_args[0][3] == mock_frame2
+        assert result == b"rendered_frame"
+
+    def test_render_current_frame_caches_each_frame(self, animation_manager):
+        """Test that each frame is rendered once and reused on later loops."""
+        renderer = animation_manager.button_renderer
+        renderer.render_button_with_icon.side_effect = [b"frame0", b"frame1", b"frame2"]
+        animation_manager.animated_buttons[0] = {
+            "frames": [Mock(), Mock(), Mock()],
+            "current_frame": 0,
+            "config": {"text": "Test"},
+            "rendered": [None, None, None],
+        }
+
+        images = []
+        for _loop in range(2):
+            for frame_index in range(3):
+                animation_manager.animated_buttons[0]["current_frame"] = frame_index
+                images.append(animation_manager.render_current_frame(0, {}, Mock()))
+
+        assert images == [b"frame0", b"frame1", b"frame2"] * 2
+        assert renderer.render_button_with_icon.call_count == 3
+
+
+class TestAnimatedButtonUpdates:
+    """Test suite for pushing animated frames to the deck."""
+
+    def test_unchanged_frames_are_not_resent(self):
+        """Test that set_key_image is only called when a key's image changes."""
+        renderer = Mock()
+        renderer.render_button_with_icon.side_effect = [b"frame0", b"frame0", b"frame2"]
+        animation_manager = AnimationManager(renderer)
+        page_manager = PageManager(renderer, animation_manager)
+        animation_manager.animated_buttons[0] = {
+            "frames": [Mock(), Mock(), Mock()],
+            "durations_ns": [100_000_000] * 3,
+            "current_frame": 0,
+            "last_update_ns": time.monotonic_ns(),
+            "config": {"icon": "test.gif"},
+            "rendered": [None, None, None],
+        }
+        deck = MagicMock()
+
+        # Frame 0, frame 0 again (not yet due), identical frame 1, then frame 2
+        for frame_index in (0, 0, 1, 2):
+            animation_manager.animated_buttons[0]["current_frame"] = frame_index
+            animation_manager._last_update_ns = time.monotonic_ns()  # hold the throttle
+            page_manager.update_animated_buttons(deck, {"styles": {}})
+
+        assert [c.args for c in deck.set_key_image.call_args_list] == [
+            (0, b"frame0"),
+            (0, b"frame2"),
+        ]
+
+    def test_advanced_frames_share_one_deck_lock(self):
+        """Test that all keys advancing in a tick are written under a single lock."""
+        renderer = Mock()
+        renderer.render_button_with_icon.side_effect = lambda *args: object()
+        animation_manager = AnimationManager(renderer)
+        page_manager = PageManager(renderer, animation_manager)
+        for key in range(5):
+            animation_manager.animated_buttons[key] = {
+                "frames": [Mock(), Mock()],
+                "durations_ns": [100_000_000] * 2,
+                "current_frame": 1,
+                "last_update_ns": time.monotonic_ns(),
+                "config": {"icon": "test.gif"},
+                "rendered": [None, None],
+            }
+        animation_manager._last_update_ns = time.monotonic_ns()  # hold the throttle
+        deck = MagicMock()
+
+        page_manager.update_animated_buttons(deck, {"styles": {}})
+
+        deck.__enter__.assert_called_once()
+        assert deck.set_key_image.call_count == 5
@@ -3,33 +3,53 @@ Tests for graceful shutdown and signal handling.
 """
 
 import signal
-from unittest.mock import MagicMock, Mock, patch
+import threading
+import time
+from contextlib import ExitStack
+from unittest.mock import Mock, patch
 
 import pytest
 
+import decky.controller as controller_module
 from decky.controller import DeckyController
+from decky.main import main
 
 
 class TestGracefulShutdown:
     """Test suite for graceful shutdown handling."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def controller(self):
-        """Create a controller instance with mocked dependencies."""
-        with (
-            patch("decky.controller.ConfigLoader"),
-            patch("decky.controller.DeviceManager"),
-            patch("decky.controller.ButtonRenderer"),
-            patch("decky.controller.registry"),
-            patch("decky.controller.detect_platform"),
-        ):
+        """Create one controller with mocked dependencies for the whole module."""
+        # Patches only cover construction; the controller keeps the mocks it was built with
+        with ExitStack() as stack:
+            for name in (
+                "ConfigLoader",
+                "DeviceManager",
+                "ButtonRenderer",
+                "registry",
+                "detect_platform",
+            ):
+                stack.enter_context(patch.object(controller_module, name))
             controller = DeckyController("/test/config.yaml")
-            controller.config = {
-                "device": {"brightness": 75},
-                "styles": {},
-                "pages": {"main": {"buttons": {}}},
-            }
-            return controller
+
+        controller.config = {
+            "device": {"brightness": 75},
+            "styles": {},
+            "pages": {"main": {"buttons": {}}},
+        }
+        return controller
+
+    @pytest.fixture(autouse=True)
+    def restore_controller(self, controller):
+        """Undo state changes a test makes to the shared controller."""
+        manager = controller.connection_manager
+        saved = (controller.shutting_down, manager.deck, manager.is_locked)
+        yield
+        controller.shutting_down, manager.deck, manager.is_locked = saved
+        # Drop per-instance overrides so class defaults apply again
+        for name in ("MONITOR_ERROR_BACKOFF", "_monitor_once"):
+            manager.__dict__.pop(name, None)
 
     def test_shutting_down_flag_prevents_reconnection(self, controller):
         """Test that shutting_down flag prevents reconnection attempts."""
@@ -85,10 +105,28 @@ class TestGracefulShutdown:
         # The actual reconnection prevention is tested in integration tests
         # This just verifies the flag is set correctly
 
+    def test_stop_monitoring_interrupts_error_backoff(self, controller):
+        """Test that stopping the monitor does not wait out the error backoff."""
+        manager = controller.connection_manager
+        manager.MONITOR_ERROR_BACKOFF = 30.0
+        failed = threading.Event()
+
+        def failing_tick():
+            failed.set()
+            raise RuntimeError("monitor failure")
+
+        manager._monitor_once = failing_tick
+        manager.start_monitoring()
+        assert failed.wait(timeout=2)
+
+        started = time.monotonic()
+        manager.stop_monitoring()
+
+        assert time.monotonic() - started < 2
+        assert manager._monitor_thread is None
+
     def test_main_signal_handler_sets_flags(self):
         """Test that the signal handler in main.py sets the correct flags."""
-        from decky.main import main
-
         with (
             patch("decky.main.argparse.ArgumentParser") as mock_parser,
             patch("decky.main.logging.basicConfig"),
@@ -0,0 +1,134 @@
+"""
+Tests for udev-driven USB hot-plug notifications.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from decky.device import DeviceManager, hotplug
+from decky.device.hotplug import HotplugMonitor
+from decky.managers import ConnectionManager
+
+
+def _hidraw_add(hid_id):
+    """Build a stand-in for a pyudev hidraw add event whose HID parent has ``hid_id``."""
+    hid = {"HID_ID": hid_id} if hid_id is not None else None
+    parents = {"hid": hid}
+    return SimpleNamespace(action="add", subsystem="hidraw", find_parent=parents.get, get={}.get)
+
+
+def _usb_device(action, product):
+    """Build a stand-in for a pyudev USB device event carrying only what the monitor reads."""
+    return SimpleNamespace(action=action, subsystem="usb", get={"PRODUCT": product}.get)
+
+
+class TestHotplugMonitor:
+    """Test suite for HotplugMonitor event filtering."""
+
+    @pytest.mark.parametrize(
+        "device",
+        [
+            pytest.param(_hidraw_add("0003:00000FD9:00000060"), id="hidraw_add"),
+            pytest.param(_usb_device("remove", "fd9/60/100"), id="usb_remove"),
+        ],
+    )
+    def test_forwards_stream_deck_events(self, device):
+        """Test that Elgato hidraw adds and USB removes reach the callback."""
+        on_event = Mock()
+        HotplugMonitor(on_event)._handle_device(device)
+
+        on_event.assert_called_once_with(device.action)
+
+    @pytest.mark.parametrize(
+        "device",
+        [
+            pytest.param(_hidraw_add("0003:0000046D:0000C52B"), id="other_vendor_add"),
+            pytest.param(_usb_device("remove", "46d/c52b/1211"), id="other_vendor_remove"),
+            pytest.param(_usb_device("add", "fd9/60/100"), id="usb_add_before_hid_bind"),
+            pytest.param(_usb_device("bind", "fd9/60/100"), id="other_action"),
+            pytest.param(_usb_device("remove", ""), id="no_product"),
+            pytest.param(_hidraw_add(None), id="no_hid_parent"),
+        ],
+    )
+    def test_ignores_unrelated_events(self, device):
+        """Test that non-Elgato devices, early USB adds and other actions are ignored."""
+        on_event = Mock()
+        HotplugMonitor(on_event)._handle_device(device)
+
+        on_event.assert_not_called()
+
+    def test_callback_errors_are_contained(self):
+        """Test that a failing callback does not escape the observer thread."""
+        monitor = HotplugMonitor(Mock(side_effect=RuntimeError("boom")))
+
+        monitor._handle_device(_usb_device("remove", "fd9/60/100"))
+
+    def test_start_without_pyudev_falls_back_to_polling(self, monkeypatch):
+        """Test that start() reports failure when pyudev is not installed."""
+        monkeypatch.setattr(hotplug, "pyudev", None)
+        monitor = HotplugMonitor(Mock())
+
+        assert monitor.start() is False
+        assert monitor.active is False
+        monitor.stop()
+
+
+class TestConnectionManagerHotplug:
+    """Test suite for ConnectionManager's response to hot-plug events."""
+
+    @pytest.fixture
+    def connection_manager(self):
+        """Create a connection manager with throttles recently reset."""
+        manager = ConnectionManager(device_manager=Mock())
+        manager._last_reconnect_attempt = 100.0
+        manager._last_connection_check = 100.0
+        return manager
+
+    def test_add_event_clears_reconnect_throttle(self, connection_manager):
+        """Test that a plug-in event allows an immediate reconnection attempt."""
+        connection_manager._on_hotplug("add")
+
+        assert connection_manager._last_reconnect_attempt == 0
+        assert connection_manager._last_connection_check == 0
+        assert connection_manager._wake_event.is_set()
+
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_add_event_reconnects_on_next_tick(self, mock_sdm_class):
+        """Test that the monitor tick right after a plug-in event connects the deck."""
+        deck = Mock()
+        mock_sdm_class.return_value.enumerate.return_value = [deck]
+        manager = ConnectionManager(device_manager=DeviceManager())
+        manager._last_connection_check = 100.0
+        manager._last_reconnect_attempt = 100.0
+
+        manager._on_hotplug("add")
+        manager._monitor_once(current_time=100.0)
+
+        assert manager.deck is deck
+        deck.open.assert_called_once()
+
+    def test_remove_event_forces_health_check(self, connection_manager):
+        """Test that an unplug event triggers an immediate connection check."""
+        connection_manager._on_hotplug("remove")
+
+        assert connection_manager._last_connection_check == 0
+        assert connection_manager._wake_event.is_set()
+
+    @patch("decky.device.manager.StreamDeckManager")
+    def test_remove_event_drops_unplugged_deck(self, mock_sdm_class):
+        """Test that the check forced by an unplug event notices the deck is gone."""
+        mock_sdm_class.return_value.enumerate.return_value = []
+        deck = Mock()
+        deck.connected.return_value = False
+        manager = ConnectionManager(device_manager=DeviceManager())
+        manager.deck = deck
+        manager._last_connection_check = 100.0
+        manager._last_reconnect_attempt = 100.0
+
+        manager._on_hotplug("remove")
+        manager._monitor_once(current_time=100.0)
+
+        assert manager.deck is None
+        deck.close.assert_called_once()